@@ -1,5 +1,8 @@
+from array import array
 from collections import deque
 
+import numpy as np
+
 class BFS:
     def __init__(self, maze, start, goal):
         self.maze = maze
@@ -54,3 +57,137 @@ class BFS:
             node = self.parents[node]
         self.path_result.append(self.start)
         self.path_result.reverse()
+
+
+def padded_blocked(maze):
+    """uint8 grid that is 1 on walls, framed by a one-cell wall border."""
+    grid = np.asarray(maze, dtype=np.uint8)
+    blocked = np.ones((grid.shape[0] + 2, grid.shape[1] + 2), dtype=np.uint8)
+    blocked[1:-1, 1:-1] = grid != 0
+    return blocked
+
+
+class GridBFS(BFS):
+    """High-throughput BFS over a flattened occupancy grid.
+
+    Same constructor and solve()/path_result/order contract as BFS, but cells
+    are integer indices into a grid padded with a one-cell wall border, walls
+    and visited cells share one bytearray, and parents and the queue live in
+    preallocated int32 arrays. Each cell is enqueued at most once, so the
+    queue never needs to wrap. Recording `order` is optional since it is the
+    only per-cell Python object allocation left.
+    """
+
+    def __init__(self, maze, start, goal, record_order=False):
+        self.maze = maze
+        self.start = tuple(start)
+        self.goal = tuple(goal)
+        self.record_order = record_order
+
+        blocked = padded_blocked(maze)
+        self.rows, self.cols = blocked.shape[0] - 2, blocked.shape[1] - 2
+        self.width = self.cols + 2
+        self.closed = bytearray(blocked.tobytes())
+        size = len(self.closed)
+        self.parent = array('i', bytes(4 * size))
+        self.queue = array('i', bytes(4 * size))
+
+        self.path_result = []
+        self.order = []
+
+    def index(self, r, c):
+        return (r + 1) * self.width + c + 1
+
+    def cell(self, i):
+        r, c = divmod(i, self.width)
+        return (r - 1, c - 1)
+
+    def solve(self):
+        search = self.search(len(self.closed))
+        while True:
+            try:
+                next(search)
+            except StopIteration as done:
+                return done.value
+
+    def search(self, chunk=4096):
+        """
+        Run solve() incrementally: a generator that pauses after every `chunk` expansions
+        and yields how many cells have been expanded so far, so the caller can report
+        progress or stop early. Its return value is solve()'s. With record_order the
+        first that many entries of `order` are already (row, col) cells at each pause.
+        """
+        closed, parent, queue = self.closed, self.parent, self.queue
+        w = self.width
+        start = self.index(*self.start)
+        goal = self.index(*self.goal) if self.inbounds(*self.goal) else -1
+        record = self.record_order
+        order = self.order
+        self._converted = 0
+
+        closed[start] = 1
+        queue[0] = start
+        head, tail = 0, 1
+        pause = chunk
+        while head < tail:
+            if head == pause:
+                pause += chunk
+                if record:
+                    self._convert_order()
+                yield head
+            current = queue[head]
+            head += 1
+            if record:
+                order.append(current)
+
+            if current == goal:
+                self._finish(start, goal)
+                return True
+
+            # Same neighbour order as BFS.neighbors: down, up, right, left.
+            nb = current + w
+            if not closed[nb]:
+                closed[nb] = 1
+                parent[nb] = current
+                queue[tail] = nb
+                tail += 1
+            nb = current - w
+            if not closed[nb]:
+                closed[nb] = 1
+                parent[nb] = current
+                queue[tail] = nb
+                tail += 1
+            nb = current + 1
+            if not closed[nb]:
+                closed[nb] = 1
+                parent[nb] = current
+                queue[tail] = nb
+                tail += 1
+            nb = current - 1
+            if not closed[nb]:
+                closed[nb] = 1
+                parent[nb] = current
+                queue[tail] = nb
+                tail += 1
+
+        self._finish(start, None)
+        return False
+
+    def _convert_order(self):
+        """Turn the flat indices recorded since the last call into (row, col) cells."""
+        cell, order, done = self.cell, self.order, self._converted
+        order[done:] = [cell(i) for i in order[done:]]
+        self._converted = len(order)
+
+    def _finish(self, start, goal):
+        cell = self.cell
+        if self.record_order:
+            self._convert_order()
+        if goal is None:
+            return
+        node = goal
+        while node != start:
+            self.path_result.append(cell(node))
+            node = self.parent[node]
+        self.path_result.append(cell(start))
+        self.path_result.reverse()
@@ -1,8 +1,9 @@
 import random
 import numpy as np
 import math
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
+from collision import SegmentCollider
+from nn_index import make_index
+from tree_store import NodeView, TreeStore
 
 class Obstacle:
     def __init__(self, obstacle=None):
@@ -90,11 +91,30 @@ class Obstacle:
 
         return self.obstacle
 
-# Initialize obstacles global for default param usage
-obs = Obstacle()
-obs.default()  
+_default_obstacle = None
+
+def default_obstacle():
+    """The built-in 10x10 maze, built on first use and shared afterwards."""
+    global _default_obstacle
+    if _default_obstacle is None:
+        _default_obstacle = Obstacle()
+        _default_obstacle.default()
+    return _default_obstacle
+
+def __getattr__(name):
+    # The old module-level `obs` global, now only built when something imports it.
+    if name == "obs":
+        return default_obstacle()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def path_length(path):
+    """Total Euclidean length of a [[x, y], ...] path."""
+    return sum(math.hypot(path[i+1][0] - path[i][0], path[i+1][1] - path[i][1])
+               for i in range(len(path)-1))
 
 class Node:
+    __slots__ = ("x", "y", "parent", "cost")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -102,186 +122,205 @@ class Node:
         self.cost = 0
 
 class RRT:
-    def __init__(self, start, goal, map_size, obstacle=obs, iter=500, step_size=1):
+    def __init__(self, start, goal, map_size, obstacle=None, iter=500, step_size=1, nn_index="grid", seed=None,
+                 goal_radius=None, remember_blocked=True):
         self._start = start
         self._goal = goal
         self._map_size = map_size
-        self._obstacle = obstacle
-        self._node_list = [self._start]
+        # None means the built-in maze.
+        self._obstacle = default_obstacle() if obstacle is None else obstacle
+        self._tree = TreeStore()
+        self._node_list = self._tree.nodes()
+        self._nn_index = make_index(nn_index, step_size)
         self._goal_reached = False
         self._path = None
         self._max_iter = iter
         self.step_size = step_size
-        self._obstacle_lines = self.obs_to_line()
+        # New nodes within goal_radius try a straight edge to the goal.
+        self.goal_radius = step_size if goal_radius is None else goal_radius
+        # (nearest vertex, sample) pairs whose extension hit a wall; plan() skips them instead of rechecking
+        # and counts the skips in blocked_skips.
+        self.remember_blocked = remember_blocked
+        self._blocked = set()
+        self.blocked_skips = 0
+        self._collider = SegmentCollider(self._obstacle)
+        # Without a seed the single-sample loop keeps drawing from the global `random` state.
+        self._random = random if seed is None else random.Random(seed)
+        self._rng = np.random.default_rng(seed)
+        self._iterations = 0
+        self.add_node(self._start)
+
+    def add_node(self, node):
+        """Append a node to the tree and register it with the nearest-neighbor index."""
+        parent = -1 if node.parent is None else node.parent.index
+        return self._tree.node(self._add(node.x, node.y, node.cost, parent))
+
+    def _add(self, x, y, cost, parent):
+        self._nn_index.add(x, y)
+        return self._tree.add(x, y, cost, parent)
     
     def random_node(self):
         """Generate a random node in the map."""
-        if random.random() <= 0.7:
-            rand_node = Node(random.randint(0, self._map_size), random.randint(0, self._map_size))
-        else:
-            rand_node = Node(self._goal.x, self._goal.y)
-        return rand_node
+        return Node(*self._sample())
+
+    def _sample(self):
+        rand = self._random
+        if rand.random() <= 0.7:
+            return rand.randint(0, self._map_size), rand.randint(0, self._map_size)
+        return self._goal.x, self._goal.y
+
+    def _sample_batch(self, k):
+        """k samples drawn like _sample, as two float arrays."""
+        rng = self._rng
+        xs = rng.integers(0, self._map_size, size=k, endpoint=True).astype(float)
+        ys = rng.integers(0, self._map_size, size=k, endpoint=True).astype(float)
+        to_goal = rng.random(k) > 0.7
+        xs[to_goal] = self._goal.x
+        ys[to_goal] = self._goal.y
+        return xs, ys
 
     def nearest_node(self, node_list, rand_node):
         """Find the nearest node in the tree to the random node"""
+        if node_list is self._node_list and len(self._nn_index) == len(node_list):
+            return node_list[self._nn_index.nearest(rand_node.x, rand_node.y)]
         distances = [np.linalg.norm([node.x - rand_node.x, node.y - rand_node.y]) for node in node_list]
         nearest_node = node_list[np.argmin(distances)]
         return nearest_node
     
     def plan(self):
         """Main RRT planning loop"""
+        tree, nn_index, collider = self._tree, self._nn_index, self._collider
+        blocked, remember = self._blocked, self.remember_blocked
         for i in range(self._max_iter):
-            rand_node = self.random_node()
-            nearest_node = self.nearest_node(self._node_list, rand_node)
-            new_node = self.steer(nearest_node, rand_node)
-
-            if self.is_collision_free(nearest_node, new_node):
-                new_node.parent = nearest_node
-                self._node_list.append(new_node)
-            
-            if self.reached_goal(new_node):
-                self._path = self.generate_final_path(new_node)
-                self._goal_reached = True
+            rand_x, rand_y = self._sample()
+            nearest = nn_index.nearest(rand_x, rand_y)
+            # Every sample counts against iter, including redraws of a known-blocked extension.
+            if (nearest, rand_x, rand_y) in blocked:
+                self.blocked_skips += 1
+                continue
+            near_x, near_y = tree.point(nearest)
+            new_x, new_y, cost = self._steer(near_x, near_y, tree.cost.item(nearest), rand_x, rand_y)
+            if (new_x, new_y) == (near_x, near_y) or not collider.is_free(near_x, near_y, new_x, new_y):
+                if remember:
+                    blocked.add((nearest, rand_x, rand_y))
+                continue
+            new_index = self._add(new_x, new_y, cost, nearest)
+
+            if self._goal_check(new_index, new_x, new_y):
+                self._iterations += i + 1
                 return
+        self._iterations += self._max_iter
+
+    def _goal_check(self, i, x, y):
+        """Finish at the goal if new vertex i at (x, y) lies within goal_radius of it."""
+        return (math.hypot(x - self._goal.x, y - self._goal.y) <= self.goal_radius
+                and self._connect_goal(i))
+
+    def _connect_goal(self, i):
+        """
+        Finish at the goal from vertex i if the straight edge to it is free; otherwise
+        fall back to the old rule of i being within step_size of the goal.
+        """
+        tree = self._tree
+        x, y = tree.point(i)
+        goal_x, goal_y = self._goal.x, self._goal.y
+        if (x, y) != (goal_x, goal_y) and self._collider.is_free(x, y, goal_x, goal_y):
+            i = self._add(goal_x, goal_y, tree.cost.item(i) + math.hypot(goal_x - x, goal_y - y), i)
+        elif not self._reached_goal(x, y):
+            return False
+        self._path = tree.path_to(i)
+        self._goal_reached = True
+        return True
+
+    def plan_batch(self, batch_size=16):
+        """Batched RRT: sample, steer and collision-check batch_size samples per step.
+
+        Every sample in a batch extends the tree as it stood at the start of the
+        batch, so large batches trade extra iterations for less interpreter
+        overhead. Samples come from the seeded NumPy generator, so a given seed
+        always reproduces the same tree. Nearest-node lookups are one query per
+        batch, and like plan() extensions already known to hit a wall are
+        dropped before the batch is collision-checked. New vertices go through
+        the same goal_radius test and goal connection as in plan().
+        """
+        tree, collider, step = self._tree, self._collider, self.step_size
+        blocked, remember = self._blocked, self.remember_blocked
+        done = 0
+        while done < self._max_iter:
+            k = min(batch_size, self._max_iter - done)
+            done += k
+            rand_x, rand_y = self._sample_batch(k)
+            nearest = self._nn_index.nearest_many(rand_x, rand_y)
+            pairs = list(zip(nearest.tolist(), rand_x.tolist(), rand_y.tolist()))
+            # Batch positions still worth checking; skipped samples still count as iterations.
+            live = np.flatnonzero([pair not in blocked for pair in pairs]) if blocked else np.arange(k)
+            self.blocked_skips += k - len(live)
+            if not len(live):
+                continue
+            nearest, rand_x, rand_y = nearest[live], rand_x[live], rand_y[live]
+            near_x, near_y = tree.x[nearest], tree.y[nearest]
+
+            # Vectorised steer: walk step_size toward the sample, or land on it.
+            dx, dy = rand_x - near_x, rand_y - near_y
+            dist = np.hypot(dx, dy)
+            far = dist >= step
+            scale = np.where(far, step / np.where(far, dist, 1.0), 1.0)
+            new_x = near_x + dx * scale
+            new_y = near_y + dy * scale
+            cost = tree.cost[nearest] + np.where(far, step, dist)
+
+            free = (dist > 0) & collider.edges_free(np.column_stack((near_x, near_y)),
+                                                    np.column_stack((new_x, new_y)))
+            if remember:
+                blocked.update(pairs[j] for j in live[~free].tolist())
+            keep = np.flatnonzero(free)
+            for pos, x, y, c, p in zip(live[keep].tolist(), new_x[keep].tolist(), new_y[keep].tolist(),
+                                       cost[keep].tolist(), nearest[keep].tolist()):
+                if self._goal_check(self._add(x, y, c, p), x, y):
+                    self._iterations += done - k + pos + 1
+                    return
+        self._iterations += done
     
     def steer(self, from_node, to_node):
         """Steer from one node to another, step-by-step."""
-        dist = math.hypot(to_node.x - from_node.x, to_node.y - from_node.y)
-
-        if dist < self.step_size:
-            # If target is close, just go there!
-            new_x = to_node.x
-            new_y = to_node.y
-            cost_increment = dist
-        else:
-            # If target is far, Step forward by step_size
-            theta = math.atan2(to_node.y - from_node.y, to_node.x - from_node.x)
-            new_x = from_node.x + self.step_size * math.cos(theta)
-            new_y = from_node.y + self.step_size * math.sin(theta)
-            cost_increment = self.step_size
-        
+        new_x, new_y, cost = self._steer(from_node.x, from_node.y, from_node.cost, to_node.x, to_node.y)
         new_node = Node(new_x, new_y)
-        new_node.cost = from_node.cost + cost_increment
+        new_node.cost = cost
         return new_node
 
-    def obs_to_line(self):
-        """Convert obstacle line segments to line equations (a, b) where y = ax + b.
-        Vertical lines are marked as (inf, x_intercept)."""
-        res = []
-        obstacles = self._obstacle.obstacle if hasattr(self._obstacle, 'obstacle') else self._obstacle
-        
-        for (m, n) in obstacles:
-            m_x, m_y = m
-            n_x, n_y = n
-            
-            # Vertical line
-            if m_x == n_x:
-                res.append((float('inf'), m_x))   # a = inf, b = x-intercept
-            else:
-                a = (m_y - n_y) / (m_x - n_x)
-                b = m_y - m_x * a
-                res.append((a, b))
-        
-        return res
-
-    def is_intersection(self, seg_a, seg_b, node):
-        """Check if point `node` lies within the bounding box of segment endpoints seg_a and seg_b.
-        Accepts seg_a and seg_b as either tuples (x, y) or Node objects."""
-        # Handle both tuple and Node formats
-        if isinstance(seg_a, tuple):
-            x_a, y_a = seg_a
-        else:
-            x_a, y_a = seg_a.x, seg_a.y
-        
-        if isinstance(seg_b, tuple):
-            x_b, y_b = seg_b
-        else:
-            x_b, y_b = seg_b.x, seg_b.y
-        
-        x = node.x
-        y = node.y
-        
-        # Check if point is within the bounds (with small epsilon for float errors)
-        return (
-            min(x_a, x_b) - 1e-6 <= x <= max(x_a, x_b) + 1e-6 and
-            min(y_a, y_b) - 1e-6 <= y <= max(y_a, y_b) + 1e-6
-        )
+    def _steer(self, from_x, from_y, from_cost, to_x, to_y):
+        dist = math.hypot(to_x - from_x, to_y - from_y)
+
+        if dist < self.step_size:
+            # If target is close, just go there!
+            return to_x, to_y, from_cost + dist
+        # If target is far, Step forward by step_size
+        theta = math.atan2(to_y - from_y, to_x - from_x)
+        new_x = from_x + self.step_size * math.cos(theta)
+        new_y = from_y + self.step_size * math.sin(theta)
+        return new_x, new_y, from_cost + self.step_size
 
     def is_collision_free(self, from_node, to_node):
         """Check if the path segment from from_node to to_node intersects any obstacle line segment."""
-        obstacles = self._obstacle.obstacle if hasattr(self._obstacle, 'obstacle') else self._obstacle
-        if not obstacles:
-            return True
-
-        res = self._obstacle_lines
-
-        # Path line equation
-        if abs(from_node.x - to_node.x) < 1e-6:
-            a = float('inf')  # vertical line
-            b = from_node.x
-        else:
-            a = (from_node.y - to_node.y) / (from_node.x - to_node.x)
-            b = from_node.y - from_node.x * a
-
-        # Check against every obstacle
-        for i in range(len(obstacles)):
-            (m, n) = obstacles[i]
-            m_x, m_y = m
-            n_x, n_y = n
-            a_i, b_i = res[i]
-
-            intersect_node = None
-
-            # -------- CASE 1: BOTH LINES VERTICAL --------
-            if a == float('inf') and a_i == float('inf'):
-                if abs(b - b_i) < 1e-6:  # same x = constant line
-                    # Check y-range overlap
-                    if not (max(from_node.y, to_node.y) < min(m_y, n_y) or
-                            min(from_node.y, to_node.y) > max(m_y, n_y)):
-                        return False
-                continue
-
-            # -------- CASE 2: PATH VERTICAL, OBSTACLE NON-VERTICAL --------
-            elif a == float('inf') and a_i != float('inf'):
-                x = b
-                y = a_i * x + b_i
-                intersect_node = Node(x, y)
-
-            # -------- CASE 3: OBSTACLE VERTICAL, PATH NON-VERTICAL --------
-            elif a_i == float('inf') and a != float('inf'):
-                x = b_i
-                y = a * x + b
-                intersect_node = Node(x, y)
-
-            # -------- CASE 4: BOTH NON-VERTICAL --------
-            else:
-                if abs(a - a_i) < 1e-6:
-                    # Parallel lines
-                    continue
-                else:
-                    # Compute true intersection point
-                    x = (b_i - b) / (a - a_i)
-                    y = a * x + b
-                    intersect_node = Node(x, y)
-
-            # [FIXED LOGIC] If we found an intersection point, we must check if it lies 
-            # on BOTH the path segment AND the obstacle segment.
-            if intersect_node:
-                on_path = self.is_intersection(from_node, to_node, intersect_node)
-                on_obstacle = self.is_intersection(m, n, intersect_node)
-                
-                if on_path and on_obstacle:
-                    return False
+        return self._collider.is_free(from_node.x, from_node.y, to_node.x, to_node.y)
 
-        return True
+    def edges_collision_free(self, from_nodes, to_nodes):
+        """Batch version of is_collision_free; returns one bool per (from, to) pair."""
+        starts = [(node.x, node.y) for node in from_nodes]
+        ends = [(node.x, node.y) for node in to_nodes]
+        return self._collider.edges_free(starts, ends)
     
     def reached_goal(self, node):
         """Check if the node has reached the goal."""
-        dist = math.hypot(node.x - self._goal.x, node.y - self._goal.y)
-        return dist <= self.step_size
+        return self._reached_goal(node.x, node.y)
+
+    def _reached_goal(self, x, y):
+        return math.hypot(x - self._goal.x, y - self._goal.y) <= self.step_size
 
     def generate_final_path(self, goal_node):
         """Generate the final path from the start to the goal."""
+        if isinstance(goal_node, NodeView):
+            return goal_node.tree.path_to(goal_node.index)
         path = []
         node = goal_node
         while node is not None:
@@ -293,30 +332,16 @@ class RRT:
         """
         Visualize the RRT tree, obstacles, start, goal, and path.
         """
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(figsize=figsize)
         
-        # Get obstacles
-        obstacles = self._obstacle.obstacle if hasattr(self._obstacle, 'obstacle') else self._obstacle
-        
-        # Draw obstacles
-        if obstacles:
-            for obstacle in obstacles:
-                point1, point2 = obstacle
-                x1, y1 = point1
-                x2, y2 = point2
-                ax.plot([x1, x2], [y1, y2], 'k-', linewidth=3, label='Obstacles' if obstacle == obstacles[0] else '')
-        
-        # Draw RRT tree
-        if show_tree and self._node_list:
-            for node in self._node_list[1:]:
-                if node.parent is not None:
-                    ax.plot([node.parent.x, node.x], [node.parent.y, node.y], 
-                           'lightblue', linewidth=0.5, alpha=0.6, zorder=1)
-            
-            node_x = [node.x for node in self._node_list]
-            node_y = [node.y for node in self._node_list]
-            ax.scatter(node_x, node_y, c='lightblue', s=20, alpha=0.6, 
-                      edgecolors='blue', linewidths=0.5, zorder=2, label='RRT Nodes')
+        # Draw obstacles and RRT tree, one collection each
+        from rrt_render import TreeRenderer, draw_obstacles
+
+        draw_obstacles(ax, self._obstacle)
+        if show_tree and len(self._tree):
+            TreeRenderer(ax, self._tree).draw_all()
         
         # Draw final path if found
         if show_path and self._path is not None:
@@ -354,10 +379,7 @@ class RRT:
         info_text += f"Nodes: {len(self._node_list)}\n"
         info_text += f"Goal Reached: {'Yes' if self._goal_reached else 'No'}"
         if self._path is not None:
-            path_length = sum(math.hypot(self._path[i+1][0] - self._path[i][0], 
-                                       self._path[i+1][1] - self._path[i][1]) 
-                            for i in range(len(self._path)-1))
-            info_text += f"\nPath Length: {path_length:.2f}"
+            info_text += f"\nPath Length: {path_length(self._path):.2f}"
         
         # [FIXED SYNTAX] Removed invalid type hinting syntax for bbox dict
         ax.text(0.02, 0.98, info_text, transform=ax.transAxes, 
@@ -367,76 +389,21 @@ class RRT:
         plt.tight_layout()
         return fig, ax
     
-    def visualize_animation(self, step=10, title="RRT Path Planning Animation", figsize=(10, 10)):
+    def visualize_animation(self, step=10, title="RRT Path Planning Animation", figsize=(10, 10), out=None, fps=30):
         """
-        Visualize the RRT tree growth step by step.
+        Visualize the RRT tree growth step by step, one frame per `step` new nodes.
+        With out set to a directory (PNG frames) or a video file, render off-screen instead.
         """
-        fig, ax = plt.subplots(figsize=figsize)
-        
-        obstacles = self._obstacle.obstacle if hasattr(self._obstacle, 'obstacle') else self._obstacle
-        
-        if obstacles:
-            for obstacle in obstacles:
-                point1, point2 = obstacle
-                x1, y1 = point1
-                x2, y2 = point2
-                ax.plot([x1, x2], [y1, y2], 'k-', linewidth=3)
-        
-        previous_node_count = 1
-        
-        ax.scatter(self._start.x, self._start.y, c='green', s=200, 
-                  marker='o', edgecolors='darkgreen', linewidths=2, zorder=7, label='Start')
-        ax.scatter(self._goal.x, self._goal.y, c='red', s=200, 
-                  marker='*', edgecolors='darkred', linewidths=2, zorder=7, label='Goal')
-        
-        for i in range(self._max_iter):
-            rand_node = self.random_node()
-            nearest_node = self.nearest_node(self._node_list, rand_node)
-            new_node = self.steer(nearest_node, rand_node)
-
-            if new_node and self.is_collision_free(nearest_node, new_node):
-                new_node.parent = nearest_node
-                self._node_list.append(new_node)
-                
-                ax.plot([nearest_node.x, new_node.x], [nearest_node.y, new_node.y], 
-                       'lightblue', linewidth=0.5, alpha=0.6, zorder=1)
-                ax.scatter(new_node.x, new_node.y, c='lightblue', s=20, alpha=0.6, 
-                          edgecolors='blue', linewidths=0.5, zorder=2)
-                
-                if len(self._node_list) - previous_node_count >= step:
-                    ax.set_title(f"{title} - Iteration {i+1}, Nodes: {len(self._node_list)}", 
-                               fontsize=14, fontweight='bold')
-                    plt.pause(0.01)
-                    previous_node_count = len(self._node_list)
-            
-            if new_node and self.reached_goal(new_node):
-                self._path = self.generate_final_path(new_node)
-                self._goal_reached = True
-                
-                path_x = [point[0] for point in self._path]
-                path_y = [point[1] for point in self._path]
-                ax.plot(path_x, path_y, 'r-', linewidth=3, zorder=5, label='Final Path')
-                ax.scatter(path_x, path_y, c='red', s=50, zorder=6, edgecolors='darkred', linewidths=1.5)
-                
-                ax.set_title(f"{title} - Goal Reached! Iteration {i+1}", 
-                           fontsize=14, fontweight='bold', color='green')
-                plt.pause(0.1)
-                break
-        
-        ax.set_xlim(-1, self._map_size + 1)
-        ax.set_ylim(-1, self._map_size + 1)
-        ax.set_aspect('equal')
-        ax.grid(True, alpha=0.3, linestyle='--')
-        ax.set_xlabel('X', fontsize=12)
-        ax.set_ylabel('Y', fontsize=12)
-        ax.legend(loc='upper right', fontsize=10)
-        plt.tight_layout()
-        return fig, ax
+        from rrt_render import animate
+
+        return animate(self, step=step, title=title, figsize=figsize, out=out, fps=fps)
 
 def visualize_rrt_example():
     """
     Example function demonstrating how to use RRT with visualization.
     """
+    import matplotlib.pyplot as plt
+
     obstacles = Obstacle()
     obstacles.default()
     
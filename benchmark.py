@@ -0,0 +1,204 @@
+import argparse
+import csv
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from RRT_mazesolving import RRT, Node, path_length
+from grid_segments import cell_to_point, grid_to_obstacle
+from grid_solvers import SOLVERS
+from rrt_connect import RRTConnect
+from wavefront import DistanceField
+
+FIELDS = ["algorithm", "size", "density", "seed", "solved", "time", "peak_memory", "nodes",
+          "collision_checks", "intersection_tests", "path_length", "path_points"]
+
+
+class Case:
+    """One benchmark input: a seeded random occupancy grid, with its wall segments built on demand."""
+
+    def __init__(self, size, density, seed):
+        self.size = size
+        self.density = density
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self.maze = (rng.random((size, size)) < density).astype(np.uint8)
+        self.start, self.goal = (0, 0), (size - 1, size - 1)
+        self.maze[self.start] = self.maze[self.goal] = 0
+        self._obstacle = None
+
+    @property
+    def obstacle(self):
+        if self._obstacle is None:
+            self._obstacle = grid_to_obstacle(self.maze)
+        return self._obstacle
+
+
+def _grid_runner(solver):
+    def run(case, **options):
+        s = solver(case.maze, case.start, case.goal)
+        solved = s.solve()
+        path = s.path_result
+        return {"solved": solved, "nodes": len(s.order), "path": path}
+    return run
+
+
+def _run_distance_field(case, **options):
+    field = DistanceField(case.maze, case.start)
+    path = field.path_to(case.goal)
+    return {"solved": bool(path), "nodes": int((field.distances >= 0).sum()), "path": path}
+
+
+def _rrt_runner(planner, method="plan"):
+    def run(case, rrt_iter=5000, step_size=0.5, **options):
+        rows = case.size
+        rrt = planner(Node(*cell_to_point(*case.start, rows)), Node(*cell_to_point(*case.goal, rows)), rows,
+                      obstacle=case.obstacle, iter=rrt_iter, step_size=step_size, seed=case.seed)
+        getattr(rrt, method)()
+        return {"solved": rrt._goal_reached, "nodes": len(rrt._node_list) + len(getattr(rrt, "_goal_tree", ())),
+                "collision_checks": rrt._collider.queries, "intersection_tests": rrt._collider.narrow_tests,
+                "path": rrt._path or []}
+    return run
+
+
+ALGORITHMS = {name: _grid_runner(solver) for name, solver in SOLVERS.items()}
+ALGORITHMS["DistanceField"] = _run_distance_field
+ALGORITHMS["RRT"] = _rrt_runner(RRT)
+ALGORITHMS["RRT-batch"] = _rrt_runner(RRT, "plan_batch")
+ALGORITHMS["RRT-Connect"] = _rrt_runner(RRTConnect)
+
+
+def run_one(name, case, repeat=1, memory=True, **options):
+    """
+    Benchmark one algorithm on one case. Time is the best of `repeat` untraced runs;
+    peak memory comes from one extra run under tracemalloc, so tracing never skews the time.
+    """
+    runner = ALGORITHMS[name]
+    if name.startswith("RRT"):
+        # Build the wall segments shared by the RRT runs outside the timed region.
+        _ = case.obstacle
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        stats = runner(case, **options)
+        times.append(time.perf_counter() - t0)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        runner(case, **options)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    path = stats.pop("path")
+    return {
+        "algorithm": name, "size": case.size, "density": case.density, "seed": case.seed,
+        "solved": bool(stats["solved"]), "time": min(times), "peak_memory": peak,
+        "nodes": stats["nodes"], "collision_checks": stats.get("collision_checks"),
+        "intersection_tests": stats.get("intersection_tests"),
+        "path_length": path_length(path) if path else None, "path_points": len(path),
+    }
+
+
+def run_matrix(algorithms=None, sizes=(32, 64, 128), densities=(0.0, 0.2, 0.3), seeds=(0, 1, 2),
+               repeat=1, memory=True, verbose=False, **options):
+    """Every algorithm on every (size, density, seed) case; returns one result dict per run."""
+    algorithms = list(ALGORITHMS) if algorithms is None else list(algorithms)
+    results = []
+    for size in sizes:
+        for density in densities:
+            for seed in seeds:
+                case = Case(size, density, seed)
+                for name in algorithms:
+                    row = run_one(name, case, repeat, memory, **options)
+                    results.append(row)
+                    if verbose:
+                        print(f"{name:16s} size={size:5d} density={density:.2f} seed={seed:3d} "
+                              f"solved={row['solved']!s:5s} time={row['time'] * 1000:9.2f} ms", file=sys.stderr)
+    return results
+
+
+def scaling(results):
+    """Median time per (algorithm, size) over densities and seeds, for plotting scaling curves."""
+    grouped = {}
+    for row in results:
+        grouped.setdefault((row["algorithm"], row["size"]), []).append(row["time"])
+    return {key: statistics.median(times) for key, times in sorted(grouped.items())}
+
+
+def write_json(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=1)
+
+
+def write_csv(results, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def check_regressions(results, baseline, tolerance=0.25, min_time=1e-3):
+    """
+    Runs that got slower than their baseline run by more than `tolerance` (a fraction).
+
+    Runs are matched on algorithm, size, density and seed; unmatched runs are
+    ignored. min_time is an absolute slack so sub-millisecond timer noise
+    never counts as a regression. Returns (result, baseline result) pairs.
+    """
+    def key(row):
+        return (row["algorithm"], row["size"], row["density"], row["seed"])
+
+    base = {key(row): row for row in baseline}
+    slower = []
+    for row in results:
+        old = base.get(key(row))
+        if old is not None and row["time"] > old["time"] * (1 + tolerance) + min_time:
+            slower.append((row, old))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the maze solvers over sizes, densities and seeds.")
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), default=None)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[32, 64, 128])
+    parser.add_argument("--densities", nargs="+", type=float, default=[0.0, 0.2, 0.3])
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--rrt-iter", type=int, default=5000)
+    parser.add_argument("--step-size", type=float, default=0.5)
+    parser.add_argument("--json", help="write results as JSON")
+    parser.add_argument("--csv", help="write results as CSV")
+    parser.add_argument("--baseline", help="JSON results to check for regressions against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run_matrix(args.algorithms, args.sizes, args.densities, args.seeds, args.repeat,
+                         not args.no_memory, verbose=True, rrt_iter=args.rrt_iter, step_size=args.step_size)
+    if args.json:
+        write_json(results, args.json)
+    if args.csv:
+        write_csv(results, args.csv)
+    for (name, size), t in scaling(results).items():
+        print(f"{name:16s} size={size:5d} median time={t * 1000:9.2f} ms")
+
+    if args.baseline:
+        slower = check_regressions(results, load_results(args.baseline), args.tolerance)
+        for row, old in slower:
+            print(f"REGRESSION {row['algorithm']} size={row['size']} density={row['density']} seed={row['seed']}: "
+                  f"{old['time'] * 1000:.2f} ms -> {row['time'] * 1000:.2f} ms")
+        if slower:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
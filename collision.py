@@ -0,0 +1,269 @@
+import math
+import numpy as np
+
+
+def segment_array(obstacle):
+    """Pack an Obstacle (or a raw list of ((x1, y1), (x2, y2)) walls) into an (n, 4) float array."""
+    obstacles = obstacle.obstacle if hasattr(obstacle, 'obstacle') else obstacle
+    if obstacles is None or len(obstacles) == 0:
+        return np.empty((0, 4))
+    return np.asarray(obstacles, dtype=float).reshape(-1, 4)
+
+
+def _sign(values, eps):
+    """Orientation sign with a dead zone so near-collinear points count as touching."""
+    return np.where(values > eps, 1, np.where(values < -eps, -1, 0))
+
+
+def _orient(ox, oy, px, py, qx, qy, eps):
+    """Scalar counterpart of _sign(cross(p - o, q - o))."""
+    cross = (px - ox) * (qy - oy) - (py - oy) * (qx - ox)
+    return 1 if cross > eps else (-1 if cross < -eps else 0)
+
+
+def segments_touch(x0, y0, x1, y1, ax, ay, bx, by, eps=1e-9):
+    """True if closed segments (x0, y0)-(x1, y1) and (ax, ay)-(bx, by) share a point."""
+    if (max(x0, x1) < min(ax, bx) - eps or min(x0, x1) > max(ax, bx) + eps or
+            max(y0, y1) < min(ay, by) - eps or min(y0, y1) > max(ay, by) + eps):
+        return False
+    return (_orient(x0, y0, x1, y1, ax, ay, eps) * _orient(x0, y0, x1, y1, bx, by, eps) <= 0 and
+            _orient(ax, ay, bx, by, x0, y0, eps) * _orient(ax, ay, bx, by, x1, y1, eps) <= 0)
+
+
+class SegmentGrid:
+    """Uniform-grid broad phase: each cell lists the walls whose (padded) bounding box overlaps it."""
+
+    def __init__(self, segments, cell_size=None):
+        n = self._n_walls = len(segments)
+        lo = segments.reshape(-1, 2).min(axis=0) if n else np.zeros(2)
+        hi = segments.reshape(-1, 2).max(axis=0) if n else np.ones(2)
+        if cell_size is None:
+            cell_size = max(float((hi - lo).max()) / max(1.0, np.ceil(np.sqrt(n))), 1e-6)
+        self.cell_size = float(cell_size)
+        # Walls lying on a cell boundary are registered on both sides of it.
+        self._pad = 1e-7 * self.cell_size + SegmentCollider.EPS
+        self._ox, self._oy = np.floor(lo / self.cell_size).astype(int)
+        self.nx, self.ny = (np.floor(hi / self.cell_size).astype(int) - (self._ox, self._oy) + 1)
+
+        x_lo, x_hi = self._cell_range(np.minimum(segments[:, 0], segments[:, 2]),
+                                      np.maximum(segments[:, 0], segments[:, 2]), self._ox)
+        y_lo, y_hi = self._cell_range(np.minimum(segments[:, 1], segments[:, 3]),
+                                      np.maximum(segments[:, 1], segments[:, 3]), self._oy)
+        cells = [[] for _ in range(self.nx * self.ny)]
+        for wall, (i0, i1, j0, j1) in enumerate(zip(x_lo.tolist(), x_hi.tolist(), y_lo.tolist(), y_hi.tolist())):
+            for j in range(j0, j1 + 1):
+                for i in range(i0, i1 + 1):
+                    cells[j * self.nx + i].append(wall)
+        self.cells = cells
+        # The same buckets in CSR form for vectorised lookups.
+        sizes = np.fromiter((len(c) for c in cells), dtype=np.int64, count=len(cells))
+        self._cell_start = np.concatenate(([0], np.cumsum(sizes)))
+        self._cell_items = np.fromiter((w for c in cells for w in c), dtype=np.int64, count=int(sizes.sum()))
+
+    def _cell_range(self, lo, hi, origin):
+        first = np.floor((lo - self._pad) / self.cell_size).astype(int) - origin
+        last = np.floor((hi + self._pad) / self.cell_size).astype(int) - origin
+        return first, last
+
+    def edge_cells(self, x0, y0, x1, y1):
+        """Flat ids of the in-grid cells the edge (x0, y0)-(x1, y1) passes through."""
+        c = self.cell_size
+        i0, i1 = math.floor(x0 / c) - self._ox, math.floor(x1 / c) - self._ox
+        j0, j1 = math.floor(y0 / c) - self._oy, math.floor(y1 / c) - self._oy
+        nx, ny = self.nx, self.ny
+        if abs(i1 - i0) <= 1 and abs(j1 - j0) <= 1:
+            # Short edges: the (at most 2x2) bounding block of cells.
+            return [j * nx + i
+                    for j in range(max(min(j0, j1), 0), min(max(j0, j1), ny - 1) + 1)
+                    for i in range(max(min(i0, i1), 0), min(max(i0, i1), nx - 1) + 1)]
+        # Long edges: Amanatides-Woo traversal.
+        dx, dy = x1 - x0, y1 - y0
+        step_i = 1 if dx > 0 else -1
+        step_j = 1 if dy > 0 else -1
+        t_dx = c / abs(dx) if dx else math.inf
+        t_dy = c / abs(dy) if dy else math.inf
+        t_x = ((i0 + self._ox + (dx > 0)) * c - x0) / dx if dx else math.inf
+        t_y = ((j0 + self._oy + (dy > 0)) * c - y0) / dy if dy else math.inf
+        i, j = i0, j0
+        out = []
+        for _ in range(abs(i1 - i0) + abs(j1 - j0)):
+            if 0 <= i < nx and 0 <= j < ny:
+                out.append(j * nx + i)
+            if t_x < t_y:
+                i += step_i
+                t_x += t_dx
+            else:
+                j += step_j
+                t_y += t_dy
+        # Rounding can make the walk stray by a corner and miss the last cell; always include it.
+        if 0 <= i < nx and 0 <= j < ny:
+            out.append(j * nx + i)
+        if (i, j) != (i1, j1) and 0 <= i1 < nx and 0 <= j1 < ny:
+            out.append(j1 * nx + i1)
+        return out
+
+    def candidate_pairs(self, starts, ends):
+        """(edge ids, wall ids) of every candidate pair for (k, 2) arrays of edges, without duplicates."""
+        c = self.cell_size
+        i0 = np.floor(starts[:, 0] / c).astype(np.int64) - self._ox
+        i1 = np.floor(ends[:, 0] / c).astype(np.int64) - self._ox
+        j0 = np.floor(starts[:, 1] / c).astype(np.int64) - self._oy
+        j1 = np.floor(ends[:, 1] / c).astype(np.int64) - self._oy
+        i_lo, i_hi = np.minimum(i0, i1), np.maximum(i0, i1)
+        j_lo, j_hi = np.minimum(j0, j1), np.maximum(j0, j1)
+        short = (i_hi - i_lo <= 1) & (j_hi - j_lo <= 1)
+
+        # Short edges: up to four cells of their bounding block, all at once.
+        edge_parts, cell_parts = [], []
+        for di in (0, 1):
+            for dj in (0, 1):
+                i, j = i_lo + di, j_lo + dj
+                ok = short & (i <= i_hi) & (j <= j_hi) & (i >= 0) & (i < self.nx) & (j >= 0) & (j < self.ny)
+                edge_parts.append(np.flatnonzero(ok))
+                cell_parts.append(j[ok] * self.nx + i[ok])
+        # Long edges walk the grid one by one.
+        for k in np.flatnonzero(~short).tolist():
+            ids = self.edge_cells(starts[k, 0], starts[k, 1], ends[k, 0], ends[k, 1])
+            edge_parts.append(np.full(len(ids), k, dtype=np.int64))
+            cell_parts.append(np.asarray(ids, dtype=np.int64))
+        edge_of_cell = np.concatenate(edge_parts)
+        cell = np.concatenate(cell_parts)
+
+        first = self._cell_start[cell]
+        counts = self._cell_start[cell + 1] - first
+        total = int(counts.sum())
+        edges = np.repeat(edge_of_cell, counts)
+        # Position of each pair inside its cell's bucket, then the bucket entry itself.
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        walls = self._cell_items[np.repeat(first, counts) + offsets]
+        keys = np.unique(edges * self._n_walls + walls)
+        return keys // self._n_walls, keys % self._n_walls
+
+    def candidates(self, x0, y0, x1, y1):
+        """Walls that may touch the edge; a superset of the true hits."""
+        cells = self.cells
+        ids = self.edge_cells(x0, y0, x1, y1)
+        if len(ids) == 1:
+            return cells[ids[0]]
+        found = set()
+        for cell in ids:
+            found.update(cells[cell])
+        return found
+
+
+class SegmentCollider:
+    """Obstacle walls packed into contiguous arrays for vectorised segment tests.
+
+    A motion segment collides with a wall when the two closed segments share a
+    point (touching counts), decided with the orientation test. With
+    broad_phase enabled a SegmentGrid picks the candidate walls first; the
+    queries / narrow_tests / narrow_skipped counters record how many walls
+    reached the exact test and how many the broad phase ruled out.
+    """
+
+    EPS = 1e-9
+    BATCH_CELLS = 1 << 20  # edges x walls evaluated per chunk in edges_free
+    SCALAR_EDGES = 24  # below this many edges, is_free per edge beats the array broad phase
+
+    def __init__(self, obstacle, broad_phase=True, cell_size=None):
+        segments = segment_array(obstacle)
+        self.segments = np.ascontiguousarray(segments)
+        self._segment_list = [tuple(s) for s in segments.tolist()]
+        self.grid = SegmentGrid(self.segments, cell_size) if broad_phase and len(segments) else None
+        self.reset_counters()
+        self._ax, self._ay, self._bx, self._by = (np.ascontiguousarray(c) for c in segments.T)
+        self._dx = self._bx - self._ax
+        self._dy = self._by - self._ay
+        self._min_x = np.minimum(self._ax, self._bx) - self.EPS
+        self._max_x = np.maximum(self._ax, self._bx) + self.EPS
+        self._min_y = np.minimum(self._ay, self._by) - self.EPS
+        self._max_y = np.maximum(self._ay, self._by) + self.EPS
+
+    def __len__(self):
+        return len(self.segments)
+
+    def reset_counters(self):
+        self.queries = 0
+        self.narrow_tests = 0
+        self.narrow_skipped = 0
+
+    def _count(self, queries, tested):
+        self.queries += queries
+        self.narrow_tests += tested
+        self.narrow_skipped += queries * len(self.segments) - tested
+
+    def _hits(self, x0, y0, x1, y1, walls):
+        """Boolean hit mask of edges (x0, y0)-(x1, y1) against the selected walls.
+
+        Edge coordinates may be scalars or column vectors; they broadcast against
+        the wall arrays.
+        """
+        ax, ay, bx, by = self._ax[walls], self._ay[walls], self._bx[walls], self._by[walls]
+        dx, dy = self._dx[walls], self._dy[walls]
+        ex, ey = x1 - x0, y1 - y0
+        eps = self.EPS
+        # Which side of the edge each wall endpoint lies on, and vice versa.
+        o1 = _sign(ex * (ay - y0) - ey * (ax - x0), eps)
+        o2 = _sign(ex * (by - y0) - ey * (bx - x0), eps)
+        o3 = _sign(dx * (y0 - ay) - dy * (x0 - ax), eps)
+        o4 = _sign(dx * (y1 - ay) - dy * (x1 - ax), eps)
+        # Bounding boxes must overlap; this also settles the collinear case.
+        boxes = ((np.minimum(x0, x1) <= self._max_x[walls]) & (np.maximum(x0, x1) >= self._min_x[walls]) &
+                 (np.minimum(y0, y1) <= self._max_y[walls]) & (np.maximum(y0, y1) >= self._min_y[walls]))
+        return (o1 * o2 <= 0) & (o3 * o4 <= 0) & boxes
+
+    def is_free(self, x0, y0, x1, y1):
+        """True if the segment (x0, y0)-(x1, y1) touches no wall."""
+        if not len(self.segments):
+            return True
+        # Motion steps are short, so the broad phase (or a vectorised bounding-box
+        # pass) leaves only a handful of walls for the exact test, which is
+        # cheaper in plain floats.
+        if self.grid is not None:
+            near = self.grid.candidates(x0, y0, x1, y1)
+        else:
+            lo_x, hi_x = min(x0, x1), max(x0, x1)
+            lo_y, hi_y = min(y0, y1), max(y0, y1)
+            near = np.flatnonzero((self._max_x >= lo_x) & (self._min_x <= hi_x) &
+                                  (self._max_y >= lo_y) & (self._min_y <= hi_y)).tolist()
+        self._count(1, len(near))
+        walls = self._segment_list
+        for wall in near:
+            ax, ay, bx, by = walls[wall]
+            if segments_touch(x0, y0, x1, y1, ax, ay, bx, by, self.EPS):
+                return False
+        return True
+
+    def edges_free(self, starts, ends):
+        """Test many edges at once; starts and ends are (k, 2) arrays. Returns a (k,) bool array."""
+        starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+        free = np.ones(len(starts), dtype=bool)
+        if not len(self.segments) or not len(starts):
+            return free
+        if self.grid is not None:
+            if len(starts) < self.SCALAR_EDGES:
+                is_free = self.is_free
+                free[:] = [is_free(x0, y0, x1, y1)
+                           for (x0, y0), (x1, y1) in zip(starts.tolist(), ends.tolist())]
+                return free
+            return self._edges_free_broad(starts, ends)
+        self._count(len(starts), len(starts) * len(self.segments))
+        chunk = max(1, self.BATCH_CELLS // len(self.segments))
+        for lo in range(0, len(starts), chunk):
+            s, e = starts[lo:lo + chunk], ends[lo:lo + chunk]
+            hits = self._hits(s[:, :1], s[:, 1:], e[:, :1], e[:, 1:], slice(None))
+            free[lo:lo + chunk] = ~hits.any(axis=1)
+        return free
+
+    def _edges_free_broad(self, starts, ends):
+        """edges_free via the broad phase: gather (edge, wall) candidate pairs, then one exact pass."""
+        edge_ids, wall_ids = self.grid.candidate_pairs(starts, ends)
+        self._count(len(starts), len(wall_ids))
+        free = np.ones(len(starts), dtype=bool)
+        if not len(wall_ids):
+            return free
+        s, e = starts[edge_ids], ends[edge_ids]
+        hits = self._hits(s[:, 0], s[:, 1], e[:, 0], e[:, 1], wall_ids)
+        free[edge_ids[hits]] = False
+        return free
@@ -0,0 +1,207 @@
+import heapq
+import math
+import time
+
+import numpy as np
+
+from BFS_mazesolving import BFS, GridBFS, padded_blocked
+
+INF = math.inf
+
+
+class DStarLite(BFS):
+    """D* Lite on the 4-connected grid, keeping its search state between calls.
+
+    Same constructor and solve()/path_result/order contract as BFS. The search
+    runs backwards from the goal, so after update_cells() changes some walls
+    only the vertices whose distance-to-goal actually changed are expanded
+    again. Like GridBFS it works on flat indices into a wall-padded grid;
+    the priority queue is a binary heap with lazy deletion, where an entry is
+    live only while it matches the key recorded for its vertex. `expanded`
+    counts the vertices popped by the last solve() or update_cells().
+    """
+
+    def __init__(self, maze, start, goal, record_order=False):
+        self.maze = maze
+        self.start = tuple(start)
+        self.goal = tuple(goal)
+        self.record_order = record_order
+
+        blocked = padded_blocked(maze)
+        self.rows, self.cols = blocked.shape[0] - 2, blocked.shape[1] - 2
+        self.width = w = self.cols + 2
+        self.blocked = bytearray(blocked.tobytes())
+        size = len(self.blocked)
+        self.g = [INF] * size
+        self.rhs = [INF] * size
+        self._queued = [None] * size
+        self._heap = []
+        self._steps = (w, -w, 1, -1)
+        self.path_result = []
+        self.order = []
+        self.expanded = 0
+
+        self._s = self.index(*self.start)
+        self._t = self.index(*self.goal)
+        self._sr, self._sc = divmod(self._s, w)
+        # BFS leaves from its start even when that cell is a wall, so the start is always passable here.
+        if self.inbounds(*self.start):
+            self.blocked[self._s] = 0
+        self._update(self._t)
+
+    def index(self, r, c):
+        return (r + 1) * self.width + c + 1
+
+    def cell(self, i):
+        r, c = divmod(i, self.width)
+        return (r - 1, c - 1)
+
+    def _key(self, i):
+        m = min(self.g[i], self.rhs[i])
+        r, c = divmod(i, self.width)
+        return (m + abs(r - self._sr) + abs(c - self._sc), m)
+
+    def _push(self, i):
+        key = self._key(i)
+        self._queued[i] = key
+        heapq.heappush(self._heap, (key, i))
+
+    def _update(self, i):
+        """Recompute rhs(i) from its successors and (re)queue i if it became inconsistent."""
+        if self.blocked[i]:
+            self.rhs[i] = INF
+        elif i == self._t:
+            # The goal is seeded here too, so walling or freeing it later is repaired like any cell.
+            self.rhs[i] = 0
+        else:
+            g, blocked = self.g, self.blocked
+            self.rhs[i] = min([g[i + d] for d in self._steps if not blocked[i + d]], default=INF) + 1
+        if self.g[i] != self.rhs[i]:
+            self._push(i)
+        else:
+            self._queued[i] = None
+
+    def _top(self):
+        heap, queued = self._heap, self._queued
+        while heap and queued[heap[0][1]] != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else (INF, INF)
+
+    def _compute(self):
+        heap, queued, g, rhs, blocked = self._heap, self._queued, self.g, self.rhs, self.blocked
+        s, steps = self._s, self._steps
+        record, order = self.record_order, []
+        expanded = 0
+        while self._top() < self._key(s) or rhs[s] != g[s]:
+            k_old, u = heapq.heappop(heap)
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u)
+                continue
+            queued[u] = None
+            expanded += 1
+            if record:
+                order.append(u)
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+                for d in steps:
+                    if not blocked[u + d]:
+                        self._update(u + d)
+            else:
+                g[u] = INF
+                self._update(u)
+                for d in steps:
+                    if not blocked[u + d]:
+                        self._update(u + d)
+        self.expanded = expanded
+        if record:
+            self.order = [self.cell(i) for i in order]
+
+    def _extract(self):
+        g, s, t = self.g, self._s, self._t
+        self.path_result = []
+        if g[s] == INF:
+            return False
+        path = [s]
+        node = s
+        while node != t:
+            node = min((node + d for d in self._steps if not self.blocked[node + d]), key=g.__getitem__)
+            path.append(node)
+        self.path_result = [self.cell(i) for i in path]
+        return True
+
+    def solve(self):
+        if self.blocked[self._s]:
+            # Only an out-of-bounds start is still blocked.
+            self.path_result = []
+            return False
+        self._compute()
+        return self._extract()
+
+    def update_cells(self, changes):
+        """
+        Apply wall changes and repair the search. changes maps (row, col) to 1 (wall)
+        or 0 (free), as a dict or an iterable of pairs; the start cell stays passable, as
+        in BFS. Returns the new path_result.
+        """
+        items = changes.items() if hasattr(changes, "items") else changes
+        touched = set()
+        for (r, c), value in items:
+            i = self.index(r, c)
+            value = 1 if value else 0
+            if not self.inbounds(r, c) or i == self._s or self.blocked[i] == value:
+                continue
+            self.blocked[i] = value
+            touched.add(i)
+            touched.update(i + d for d in self._steps)
+        for i in touched:
+            self._update(i)
+        self.solve()
+        return self.path_result
+
+
+def benchmark_repair(size=500, density=0.25, changes=5, rounds=5, seed=0):
+    """
+    Time DStarLite.update_cells against rebuilding and rerunning BFS.solve (and GridBFS)
+    after `changes` random cells flip, half of them on the current path.
+    """
+    rng = np.random.default_rng(seed)
+    maze = (rng.random((size, size)) < density).astype(np.uint8)
+    start, goal = (0, 0), (size - 1, size - 1)
+    maze[start] = maze[goal] = 0
+
+    planner = DStarLite(maze, start, goal)
+    t0 = time.perf_counter()
+    planner.solve()
+    rows = [{"round": 0, "dstar": time.perf_counter() - t0, "expanded": planner.expanded}]
+    for k in range(1, rounds + 1):
+        path = planner.path_result[1:-1]
+        picks = [path[j] for j in rng.choice(len(path), size=min(changes // 2 + 1, len(path)), replace=False)]
+        picks += [tuple(cell) for cell in rng.integers(0, size, size=(changes - len(picks), 2)).tolist()]
+        update = {cell: 1 - int(maze[cell]) for cell in picks if cell not in (start, goal)}
+        for cell, value in update.items():
+            maze[cell] = value
+
+        t0 = time.perf_counter()
+        planner.update_cells(update)
+        dstar = time.perf_counter() - t0
+        expanded = planner.expanded
+
+        nested = maze.tolist()
+        t0 = time.perf_counter()
+        bfs = BFS(nested, start, goal)
+        bfs.solve()
+        bfs_time = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        grid = GridBFS(maze, start, goal)
+        grid.solve()
+        grid_time = time.perf_counter() - t0
+        rows.append({"round": k, "dstar": dstar, "expanded": expanded, "bfs": bfs_time, "gridbfs": grid_time,
+                     "same_length": len(bfs.path_result) == len(planner.path_result)})
+    return rows
+
+
+if __name__ == "__main__":
+    for row in benchmark_repair():
+        extra = "" if row["round"] == 0 else f"  BFS {row['bfs'] * 1000:8.1f} ms  GridBFS {row['gridbfs'] * 1000:7.1f} ms"
+        print(f"round {row['round']}: D* Lite {row['dstar'] * 1000:8.1f} ms ({row['expanded']:6d} expanded){extra}")
@@ -0,0 +1,133 @@
+import numpy as np
+
+from RRT_mazesolving import Obstacle
+from collision import segment_array
+
+# Grid cell (r, c) covers x in [c, c + 1] and y in [rows - r - 1, rows - r], times
+# cell_size, so row 0 is drawn at the top as in the printed mazes.
+
+
+def cell_to_point(r, c, rows, cell_size=1.0):
+    """World coordinates of the centre of grid cell (r, c)."""
+    return (c + 0.5) * cell_size, (rows - r - 0.5) * cell_size
+
+
+def point_to_cell(x, y, rows, cell_size=1.0):
+    """Grid cell (r, c) containing the world point (x, y)."""
+    return rows - 1 - int(y // cell_size), int(x // cell_size)
+
+
+def _runs(edges):
+    """(line, first, end) of every run of True along axis 1 of a 2-D bool array, end exclusive."""
+    padded = np.zeros((edges.shape[0], edges.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = edges
+    step = np.diff(padded, axis=1)
+    line, first = np.nonzero(step == 1)
+    _, end = np.nonzero(step == -1)
+    return line, first, end
+
+
+def grid_to_segments(maze, cell_size=1.0, border=True):
+    """
+    Wall segments separating free cells from wall cells, as an (n, 4) array of x1, y1, x2, y2.
+
+    Every cell edge between a free and a wall cell becomes part of a segment,
+    and collinear neighbouring edges are run-length merged into one. With
+    border=True the area outside the grid counts as wall, so the maze is
+    closed off; otherwise only walls inside the grid produce segments.
+    """
+    grid = np.asarray(maze) != 0
+    rows, cols = grid.shape
+    blocked = np.full((rows + 2, cols + 2), border, dtype=bool)
+    blocked[1:-1, 1:-1] = grid
+
+    # Horizontal edges: row boundary k sits between rows k - 1 and k, at y = rows - k.
+    k, first, end = _runs(blocked[:-1, 1:-1] != blocked[1:, 1:-1])
+    y = (rows - k) * cell_size
+    horizontal = np.column_stack((first * cell_size, y, end * cell_size, y))
+
+    # Vertical edges: column boundary k sits between columns k - 1 and k, at x = k.
+    k, first, end = _runs((blocked[1:-1, :-1] != blocked[1:-1, 1:]).T)
+    x = k * cell_size
+    vertical = np.column_stack((x, (rows - first) * cell_size, x, (rows - end) * cell_size))
+    return np.concatenate((horizontal, vertical)).astype(float)
+
+
+def grid_to_obstacle(maze, cell_size=1.0, border=True):
+    """Obstacle built from grid_to_segments, ready to pass to RRT."""
+    segments = grid_to_segments(maze, cell_size, border)
+    return Obstacle([((x1, y1), (x2, y2)) for x1, y1, x2, y2 in segments.tolist()])
+
+
+def segments_to_grid(obstacle, rows, cols, cell_size=1.0, fill=False, border=True):
+    """
+    Rasterize wall segments (an Obstacle, a list of walls or an (n, 4) array) into a rows x cols grid.
+
+    By default a cell becomes a wall if any segment passes through or along it,
+    which turns thin walls such as Obstacle.default() into cells BFS respects.
+    fill=True is the exact inverse of grid_to_segments instead: the grid-aligned
+    vertical segments are treated as boundaries and each row is filled by
+    parity, starting from wall outside the grid when border is set.
+    """
+    segments = segment_array(obstacle) / cell_size
+    if fill:
+        return _fill_grid(segments, rows, cols, border)
+    grid = np.zeros((rows, cols), dtype=np.uint8)
+    if not len(segments):
+        return grid
+    x0, y0, x1, y1 = segments.T
+    xs, ys = [np.floor(x0), np.floor(x1)], [np.floor(y0), np.floor(y1)]
+
+    # Every point where a segment crosses a grid line marks the cells on both sides
+    # of that line; crossings that land exactly on a grid line mark both
+    # neighbours.
+    for a0, a1, b0, b1, vertical in ((x0, x1, y0, y1, True), (y0, y1, x0, x1, False)):
+        da = a1 - a0
+        lo = np.ceil(np.minimum(a0, a1))
+        counts = np.maximum(np.floor(np.maximum(a0, a1)) - lo + 1, 0).astype(np.int64)
+        counts[da == 0] = 0
+        seg = np.repeat(np.arange(len(segments)), counts)
+        offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        line = lo[seg] + offsets
+        cross = b0[seg] + (b1 - b0)[seg] * (line - a0[seg]) / da[seg]
+        for a in (line - 1, line):
+            for b in (np.floor(cross), np.ceil(cross) - 1):
+                xs.append(a if vertical else b)
+                ys.append(b if vertical else a)
+    x = np.concatenate(xs).astype(np.int64)
+    y = np.concatenate(ys).astype(np.int64)
+    r, c = rows - 1 - y, x
+    inside = (r >= 0) & (r < rows) & (c >= 0) & (c < cols)
+    grid[r[inside], c[inside]] = 1
+    return grid
+
+
+def _fill_grid(segments, rows, cols, border):
+    x0, y0, x1, y1 = segments.T
+    vertical = (x0 == x1) & (x0 == np.round(x0))
+    k = np.round(x0[vertical]).astype(np.int64)
+    top = rows - np.round(np.maximum(y0, y1)[vertical]).astype(np.int64)
+    bottom = rows - np.round(np.minimum(y0, y1)[vertical]).astype(np.int64)
+    ok = (k >= 0) & (k <= cols)
+    # Difference array over rows, so each segment costs O(1) before the cumulative sums.
+    cover = np.zeros((rows + 1, cols + 1), dtype=np.int64)
+    np.add.at(cover, (np.clip(top[ok], 0, rows), k[ok]), 1)
+    np.add.at(cover, (np.clip(bottom[ok], 0, rows), k[ok]), -1)
+    crossings = np.cumsum(cover, axis=0)[:rows, :cols] > 0
+    parity = np.cumsum(crossings, axis=1) & 1
+    return (parity ^ bool(border)).astype(np.uint8)
+
+
+if __name__ == "__main__":
+    import time
+
+    from part2 import flood_maze
+
+    maze = flood_maze(1001, 1001, seed=0)
+    t0 = time.perf_counter()
+    segments = grid_to_segments(maze)
+    t1 = time.perf_counter()
+    back = segments_to_grid(segments, *maze.shape, fill=True)
+    t2 = time.perf_counter()
+    print(f"{maze.size} cells -> {len(segments)} segments in {(t1 - t0) * 1000:.1f} ms, "
+          f"filled back in {(t2 - t1) * 1000:.1f} ms, round trip exact: {bool((back == maze).all())}")
@@ -0,0 +1,269 @@
+import heapq
+import math
+import time
+
+import numpy as np
+
+from BFS_mazesolving import BFS, GridBFS
+from dstar_lite import DStarLite
+
+SQRT2 = math.sqrt(2)
+
+
+class BidirectionalBFS(BFS):
+    """BFS grown one full layer at a time from start and goal, smaller frontier first."""
+
+    def solve(self):
+        if self.start == self.goal:
+            self.order.append(self.start)
+            self.path_result = [self.start]
+            return True
+        if not (self.inbounds(*self.goal) and self.free(*self.goal)):
+            # BFS never enters a walled goal; seeding the goal side here would.
+            return False
+        parents = ({self.start: None}, {self.goal: None})
+        frontiers = ([self.start], [self.goal])
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            mine, other = parents[side], parents[1 - side]
+            layer, best = [], None
+            for current in frontiers[side]:
+                self.order.append(current)
+                for neighbor in self.neighbors(*current):
+                    if neighbor in mine:
+                        continue
+                    mine[neighbor] = current
+                    layer.append(neighbor)
+                    if neighbor in other and best is None:
+                        # Every meeting found in this layer is equally short.
+                        best = neighbor
+            if best is not None:
+                self.visited = set(parents[0]) | set(parents[1])
+                self.parents = parents[0]
+                self._join(best, parents)
+                return True
+            frontiers = (layer, frontiers[1]) if side == 0 else (frontiers[0], layer)
+        self.visited = set(parents[0]) | set(parents[1])
+        return False
+
+    def _join(self, meet, parents):
+        head = []
+        node = meet
+        while node is not None:
+            head.append(node)
+            node = parents[0][node]
+        head.reverse()
+        node = parents[1][meet]
+        while node is not None:
+            head.append(node)
+            node = parents[1][node]
+        self.path_result = head
+
+
+class AStar(BFS):
+    """A* with a Manhattan heuristic over a binary heap; ties go to the deeper node."""
+
+    def heuristic(self, node):
+        return abs(node[0] - self.goal[0]) + abs(node[1] - self.goal[1])
+
+    def solve(self):
+        g = {self.start: 0}
+        self.parents = {}
+        heap = [(self.heuristic(self.start), 0, self.start)]
+        closed = self.visited
+        while heap:
+            _, neg_g, current = heapq.heappop(heap)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.order.append(current)
+            if current == self.goal:
+                self.generate_path()
+                return True
+            cost = -neg_g + 1
+            for neighbor in self.neighbors(*current):
+                if neighbor not in closed and cost < g.get(neighbor, math.inf):
+                    g[neighbor] = cost
+                    self.parents[neighbor] = current
+                    heapq.heappush(heap, (cost + self.heuristic(neighbor), -cost, neighbor))
+        return False
+
+
+class JumpPointSearch(BFS):
+    """Jump Point Search on a uniform-cost grid.
+
+    diagonal=False searches the same 4-connected grid as BFS; diagonal=True
+    allows diagonal steps (cost sqrt(2)) only when both adjacent orthogonal
+    cells are free, so paths never cut corners. `order` lists the expanded
+    jump points; path_result is expanded back to every cell along the way.
+    """
+
+    def __init__(self, maze, start, goal, diagonal=False):
+        super().__init__(maze, start, goal)
+        self.diagonal = diagonal
+
+    def walkable(self, r, c):
+        return self.inbounds(r, c) and self.free(r, c)
+
+    def heuristic(self, node):
+        dr, dc = abs(node[0] - self.goal[0]), abs(node[1] - self.goal[1])
+        if self.diagonal:
+            return max(dr, dc) + (SQRT2 - 1) * min(dr, dc)
+        return dr + dc
+
+    def _successors(self, r, c, parent):
+        """Pruned neighbour directions (dr, dc) of (r, c) when entered from parent."""
+        walk = self.walkable
+        if parent is None:
+            dirs = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+            if self.diagonal:
+                dirs += [(dr, dc) for dr in (1, -1) for dc in (1, -1) if walk(r + dr, c) and walk(r, c + dc)]
+            return [(dr, dc) for dr, dc in dirs if walk(r + dr, c + dc)]
+        dr = (r > parent[0]) - (r < parent[0])
+        dc = (c > parent[1]) - (c < parent[1])
+        out = []
+        if dr and dc:
+            if walk(r + dr, c):
+                out.append((dr, 0))
+            if walk(r, c + dc):
+                out.append((0, dc))
+            if walk(r + dr, c) and walk(r, c + dc):
+                out.append((dr, dc))
+        elif dc:
+            ahead, up, down = walk(r, c + dc), walk(r - 1, c), walk(r + 1, c)
+            if ahead:
+                out.append((0, dc))
+                if self.diagonal:
+                    if up:
+                        out.append((-1, dc))
+                    if down:
+                        out.append((1, dc))
+            if up:
+                out.append((-1, 0))
+            if down:
+                out.append((1, 0))
+        else:
+            ahead, left, right = walk(r + dr, c), walk(r, c - 1), walk(r, c + 1)
+            if ahead:
+                out.append((dr, 0))
+                if self.diagonal:
+                    if left:
+                        out.append((dr, -1))
+                    if right:
+                        out.append((dr, 1))
+            if left:
+                out.append((0, -1))
+            if right:
+                out.append((0, 1))
+        if self.diagonal:
+            # A diagonal step needs both orthogonal cells free.
+            out = [(a, b) for a, b in out if not (a and b) or (walk(r + a, c) and walk(r, c + b))]
+        return out
+
+    def _jump(self, r, c, dr, dc):
+        """First jump point reached stepping from (r, c) in direction (dr, dc), or None."""
+        walk, goal = self.walkable, self.goal
+        while True:
+            if not walk(r, c):
+                return None
+            if (r, c) == goal:
+                return (r, c)
+            if dr and dc:
+                if self._jump(r + dr, c, dr, 0) or self._jump(r, c + dc, 0, dc):
+                    return (r, c)
+            elif dc:
+                if ((walk(r - 1, c) and not walk(r - 1, c - dc)) or
+                        (walk(r + 1, c) and not walk(r + 1, c - dc))):
+                    return (r, c)
+            else:
+                if ((walk(r, c - 1) and not walk(r - dr, c - 1)) or
+                        (walk(r, c + 1) and not walk(r - dr, c + 1))):
+                    return (r, c)
+                # Without diagonals, vertical runs must stop where a horizontal run finds something.
+                if not self.diagonal and (self._jump(r, c + 1, 0, 1) or self._jump(r, c - 1, 0, -1)):
+                    return (r, c)
+            if dr and dc and not (walk(r + dr, c) and walk(r, c + dc)):
+                return None
+            r += dr
+            c += dc
+
+    def solve(self):
+        g = {self.start: 0.0}
+        self.parents = {}
+        heap = [(self.heuristic(self.start), 0.0, self.start)]
+        closed = self.visited
+        while heap:
+            _, neg_g, current = heapq.heappop(heap)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.order.append(current)
+            if current == self.goal:
+                self.generate_path()
+                return True
+            r, c = current
+            for dr, dc in self._successors(r, c, self.parents.get(current)):
+                jump = self._jump(r + dr, c + dc, dr, dc)
+                if jump is None or jump in closed:
+                    continue
+                steps = max(abs(jump[0] - r), abs(jump[1] - c))
+                cost = -neg_g + steps * (SQRT2 if dr and dc else 1)
+                if cost < g.get(jump, math.inf) - 1e-9:
+                    g[jump] = cost
+                    self.parents[jump] = current
+                    heapq.heappush(heap, (cost + self.heuristic(jump), -cost, jump))
+        return False
+
+    def generate_path(self):
+        """Walk back through the jump points, filling in every cell between them."""
+        node = self.goal
+        cells = [node]
+        while node != self.start:
+            parent = self.parents[node]
+            dr = (parent[0] > node[0]) - (parent[0] < node[0])
+            dc = (parent[1] > node[1]) - (parent[1] < node[1])
+            while node != parent:
+                node = (node[0] + dr, node[1] + dc)
+                cells.append(node)
+        cells.reverse()
+        self.path_result = cells
+
+
+SOLVERS = {
+    "BFS": BFS,
+    "GridBFS": lambda maze, start, goal: GridBFS(maze, start, goal, record_order=True),
+    "BidirectionalBFS": BidirectionalBFS,
+    "AStar": AStar,
+    "JPS": JumpPointSearch,
+    "JPS-8": lambda maze, start, goal: JumpPointSearch(maze, start, goal, diagonal=True),
+    "DStarLite": lambda maze, start, goal: DStarLite(maze, start, goal, record_order=True),
+}
+
+
+def benchmark_solvers(maze, start, goal, solvers=SOLVERS, repeat=1):
+    """
+    Run each solver on the same maze and report nodes expanded, path cells and best time.
+    Returns one dict per solver.
+    """
+    results = []
+    for name, solver in solvers.items():
+        times = []
+        for _ in range(repeat):
+            s = solver(maze, start, goal)
+            t0 = time.perf_counter()
+            solved = s.solve()
+            times.append(time.perf_counter() - t0)
+        results.append({"solver": name, "solved": solved, "expanded": len(s.order),
+                        "path_cells": len(s.path_result), "time": min(times)})
+    return results
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    size = 300
+    maze = (rng.random((size, size)) < 0.25).astype(int).tolist()
+    start, goal = (0, 0), (size - 1, size - 1)
+    maze[0][0] = maze[size - 1][size - 1] = 0
+    for row in benchmark_solvers(maze, start, goal, repeat=3):
+        print(f"{row['solver']:18s} solved={row['solved']!s:5s} expanded={row['expanded']:7d} "
+              f"path={row['path_cells']:5d} time={row['time'] * 1000:8.1f} ms")
@@ -0,0 +1,215 @@
+import cProfile
+import pstats
+import time
+from contextlib import contextmanager
+
+# (phase name, owner attribute on the planner or None for the planner itself, method name).
+# Phases whose method does not exist on a given planner are skipped.
+RRT_PHASES = [
+    ("sample", None, "_sample"),
+    ("sample", None, "_sample_batch"),
+    ("nearest", "_nn_index", "nearest"),
+    ("nearest", "_nn_index", "nearest_many"),
+    ("near", "_nn_index", "within"),
+    ("steer", None, "_steer"),
+    ("collision", "_collider", "is_free"),
+    ("collision", "_collider", "edges_free"),
+    ("goal_check", None, "_goal_check"),
+    ("goal_check", None, "_reached_goal"),
+    ("goal_connect", None, "_connect_goal"),
+    ("add", None, "_add"),
+]
+
+BFS_PHASES = [
+    ("neighbors", None, "neighbors"),
+    ("free", None, "free"),
+    ("inbounds", None, "inbounds"),
+    ("path", None, "generate_path"),
+]
+
+
+class PlannerStats:
+    """Per-phase timers and call counts plus named counters collected by instrument().
+
+    Phase timers are inclusive wall time in seconds (BFS "neighbors" contains
+    "free" and "inbounds"); `total` covers the whole instrumented block.
+    """
+
+    def __init__(self):
+        self.timers = {}
+        self.calls = {}
+        self.counters = {}
+        self.total = 0.0
+        self._active = set()
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def as_dict(self):
+        return {"total": self.total, "timers": dict(self.timers), "calls": dict(self.calls),
+                "counters": dict(self.counters)}
+
+    def report(self):
+        lines = [f"total {self.total * 1000:10.2f} ms"]
+        for name, t in sorted(self.timers.items(), key=lambda item: -item[1]):
+            if not self.calls[name]:
+                continue
+            share = t / self.total * 100 if self.total else 0.0
+            lines.append(f"  {name:12s} {t * 1000:10.2f} ms {share:5.1f}%  {self.calls[name]:9d} calls")
+        for name, value in self.counters.items():
+            lines.append(f"  {name:24s} {value}")
+        return "\n".join(lines)
+
+
+def _timed(stats, phase, func, after=None):
+    timers, calls, clock = stats.timers, stats.calls, time.perf_counter
+    timers.setdefault(phase, 0.0)
+    calls.setdefault(phase, 0)
+    active = stats._active
+
+    def wrapper(*args, **kwargs):
+        if phase in active:
+            # e.g. nearest_many looping over nearest: count the outer call only.
+            return func(*args, **kwargs)
+        active.add(phase)
+        t0 = clock()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            active.discard(phase)
+        timers[phase] += clock() - t0
+        calls[phase] += 1
+        if after is not None:
+            after(args, result)
+        return result
+    return wrapper
+
+
+def _rrt_hooks(planner, stats):
+    """Counters read off the return values of the wrapped RRT methods."""
+    goal = getattr(planner, "_goal", None)
+
+    def sample(args, result):
+        stats.count("samples")
+        if goal is not None and result == (goal.x, goal.y):
+            stats.count("goal_biased_samples")
+
+    def sample_batch(args, result):
+        xs, ys = result
+        stats.count("samples", len(xs))
+        if goal is not None:
+            stats.count("goal_biased_samples", int(((xs == goal.x) & (ys == goal.y)).sum()))
+
+    def is_free(args, result):
+        if "goal_connect" in stats._active:
+            # The straight edge to the goal, not an extension of a sample.
+            stats.count("goal_edges_checked")
+            if not result:
+                stats.count("goal_edges_blocked")
+        elif not result:
+            stats.count("collision_rejected")
+
+    def edges_free(args, result):
+        stats.count("collision_rejected", int(len(result) - result.sum()))
+
+    def add(args, result):
+        stats.count("nodes_added")
+
+    def connect_goal(args, result):
+        stats.count("goal_connect_attempts")
+
+    return {"_sample": sample, "_sample_batch": sample_batch, "is_free": is_free,
+            "edges_free": edges_free, "_add": add, "_connect_goal": connect_goal}
+
+
+def _bfs_hooks(solver, stats):
+    def neighbors(args, result):
+        stats.count("neighbors_yielded", len(result))
+
+    return {"neighbors": neighbors}
+
+
+@contextmanager
+def instrument(planner, stats=None, phases=None):
+    """
+    Time and count the hot-path methods of an RRT planner or BFS solver for one block.
+
+        with instrument(rrt) as stats:
+            rrt.plan()
+        print(stats.report())
+
+    The wrappers are installed as instance attributes on the planner (and on its
+    nearest-neighbor index and collider) and removed on exit, so an
+    uninstrumented planner runs its normal code with no extra cost. BFS.neighbors
+    is materialised into a list while instrumented so its time is measured.
+    """
+    stats = PlannerStats() if stats is None else stats
+    is_rrt = hasattr(planner, "_collider")
+    if phases is None:
+        phases = RRT_PHASES if is_rrt else BFS_PHASES
+    hooks = _rrt_hooks(planner, stats) if is_rrt else _bfs_hooks(planner, stats)
+
+    installed = []
+    for phase, owner_name, method in phases:
+        owner = planner if owner_name is None else getattr(planner, owner_name, None)
+        func = getattr(owner, method, None) if owner is not None else None
+        if func is None or method in vars(owner):
+            continue
+        if not is_rrt and method == "neighbors":
+            func = (lambda gen: lambda r, c: list(gen(r, c)))(func)
+        setattr(owner, method, _timed(stats, phase, func, hooks.get(method)))
+        installed.append((owner, method))
+
+    collider = getattr(planner, "_collider", None)
+    tests = collider.narrow_tests if collider is not None else 0
+    skips = getattr(planner, "blocked_skips", 0)
+    t0 = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.total += time.perf_counter() - t0
+        for owner, method in installed:
+            delattr(owner, method)
+        if collider is not None:
+            stats.count("intersection_tests", collider.narrow_tests - tests)
+        if hasattr(planner, "blocked_skips"):
+            stats.count("blocked_skipped", planner.blocked_skips - skips)
+        if not is_rrt:
+            stats.count("expanded", len(planner.order))
+            stats.count("visited", len(getattr(planner, "visited", ())))
+
+
+def profile_run(func, *args, path=None, sort="cumulative", limit=25, **kwargs):
+    """
+    Run func(*args, **kwargs) once under cProfile and print the top `limit` entries.
+
+    With path set the raw profile is also dumped there for pstats/snakeviz.
+    Returns (func's result, pstats.Stats).
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args, **kwargs)
+    if path is not None:
+        profiler.dump_stats(path)
+    stats = pstats.Stats(profiler).sort_stats(sort)
+    if limit:
+        stats.print_stats(limit)
+    return result, stats
+
+
+if __name__ == "__main__":
+    from BFS_mazesolving import BFS
+    from RRT_mazesolving import RRT, Node, obs
+    from part2 import flood_maze
+
+    rrt = RRT(Node(0.5, 9.5), Node(9.5, 0.5), 10, obstacle=obs, iter=50000, step_size=0.3, seed=0)
+    with instrument(rrt) as stats:
+        rrt.plan()
+    print("RRT.plan")
+    print(stats.report())
+
+    maze = flood_maze(201, 201, seed=0).tolist()
+    bfs = BFS(maze, (0, 0), (200, 200))
+    with instrument(bfs) as stats:
+        bfs.solve()
+    print("BFS.solve")
+    print(stats.report())
@@ -0,0 +1,376 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import Flask, Response, abort, jsonify, request
+from flask_cors import CORS
+
+from solve_cache import SolveCache, content_key
+
+QUEUED, RUNNING, DONE, CANCELLED, FAILED = "queued", "running", "done", "cancelled", "failed"
+FINISHED = (DONE, CANCELLED, FAILED)
+
+
+def _rrt_obstacle(spec):
+    from RRT_mazesolving import Obstacle
+    from grid_segments import grid_to_obstacle
+
+    if spec.get("maze") is not None:
+        return grid_to_obstacle(spec["maze"], spec.get("cell_size", 1.0))
+    if spec.get("obstacle") is not None:
+        return Obstacle([tuple(map(tuple, wall)) for wall in spec["obstacle"]])
+    obstacle = Obstacle()
+    obstacle.default()
+    return obstacle
+
+
+def _solve_bfs(spec, emit, cancelled):
+    from BFS_mazesolving import GridBFS
+
+    # GridBFS visits cells in exactly BFS order, so the streamed exploration is the same.
+    solver = GridBFS(spec["maze"], tuple(spec["start"]), tuple(spec["goal"]), record_order=True)
+    search = solver.search(spec.get("chunk", 500))
+    order = solver.order
+    sent = 0
+    t0 = time.perf_counter()
+    while True:
+        if cancelled():
+            return None
+        try:
+            expanded = next(search)
+        except StopIteration as done:
+            solved = done.value
+            break
+        emit("progress", {"cells": [list(cell) for cell in order[sent:expanded]]})
+        sent = expanded
+    elapsed = time.perf_counter() - t0
+    if len(order) > sent:
+        emit("progress", {"cells": [list(cell) for cell in order[sent:]]})
+    return {"solved": solved, "path": [list(cell) for cell in solver.path_result],
+            "expanded": len(order), "time": elapsed}
+
+
+def _solve_rrt(spec, emit, cancelled):
+    from RRT_mazesolving import RRT, Node
+
+    rrt = RRT(Node(*spec["start"]), Node(*spec["goal"]), spec.get("map_size", 10),
+              obstacle=_rrt_obstacle(spec), iter=spec.get("chunk", 200),
+              step_size=spec.get("step_size", 0.3), seed=spec.get("seed"))
+    max_iter = spec.get("iter", 50000)
+    tree = rrt._tree
+    sent = 1
+    t0 = time.perf_counter()
+    while rrt._iterations < max_iter and not rrt._goal_reached:
+        if cancelled():
+            return None
+        rrt._max_iter = min(spec.get("chunk", 200), max_iter - rrt._iterations)
+        rrt.plan()
+        n = len(tree)
+        if n > sent:
+            parent = tree.parent[sent:n]
+            edges = zip(tree.x[parent].tolist(), tree.y[parent].tolist(),
+                        tree.x[sent:n].tolist(), tree.y[sent:n].tolist())
+            emit("progress", {"edges": [list(edge) for edge in edges], "iterations": rrt._iterations})
+            sent = n
+    return {"solved": rrt._goal_reached, "path": rrt._path or [], "nodes": len(tree),
+            "iterations": rrt._iterations, "time": time.perf_counter() - t0}
+
+
+SOLVERS = {"bfs": _solve_bfs, "rrt": _solve_rrt}
+
+# Optional numeric spec fields and the types they must have; each must also be > 0.
+POSITIVE_FIELDS = {"chunk": (int,), "iter": (int,), "step_size": (int, float)}
+
+
+def _check_spec(spec):
+    """Raise ValueError for an unknown algorithm or a non-positive chunk, iter or step_size."""
+    if spec.get("algorithm") not in SOLVERS:
+        raise ValueError(f"Unknown algorithm {spec.get('algorithm')!r}; expected one of {sorted(SOLVERS)}")
+    for name, types in POSITIVE_FIELDS.items():
+        value = spec.get(name)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, types) or not value > 0:
+            kind = "integer" if types == (int,) else "number"
+            raise ValueError(f"{name} must be a positive {kind}, got {value!r}")
+
+
+def _run_job(job_id, spec, events, cancel):
+    """Worker-process entry point: solve, pushing (job id, kind, data) tuples onto the shared queue."""
+    def emit(kind, data):
+        events.put((job_id, kind, data))
+
+    emit("status", RUNNING)
+    try:
+        result = SOLVERS[spec["algorithm"]](spec, emit, cancel.is_set)
+    except Exception as exc:
+        emit("error", f"{type(exc).__name__}: {exc}")
+        return
+    if result is None:
+        emit("status", CANCELLED)
+    else:
+        emit("result", result)
+
+
+class Job:
+    """Server-side record of one solve: status, every event so far, and the final result."""
+
+    def __init__(self, spec, cancel):
+        self.id = uuid.uuid4().hex
+        self.spec = spec
+        self.status = QUEUED
+        self.events = []
+        self.result = None
+        self.error = None
+        self.cancel_event = cancel
+        self.future = None
+        self.created = time.time()
+
+    def summary(self):
+        return {"id": self.id, "algorithm": self.spec["algorithm"], "status": self.status,
+                "events": len(self.events), "result": self.result, "error": self.error}
+
+
+class JobManager:
+    """
+    Runs solve jobs on a process pool and fans their progress back in.
+
+    Workers push events onto one shared queue; a single pump thread appends
+    them to the owning Job and wakes any server-sent-event streams waiting on
+    it. Finished results go into a SolveCache keyed by the content of the
+    request (optionally persisted under cache_dir), so an identical request
+    is answered without a new solve; unseeded RRT runs are random and never
+    cached. Cancellation sets the job's shared event, which workers check
+    between progress chunks.
+    """
+
+    def __init__(self, max_workers=None, cache_size=128, keep_finished=1000, cache_dir=None):
+        ctx = multiprocessing.get_context("spawn")
+        self._manager = ctx.Manager()
+        self._events = self._manager.Queue()
+        self._pool = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1, mp_context=ctx)
+        self._jobs = OrderedDict()
+        self._cache = SolveCache(cache_size, cache_dir)
+        self._keep_finished = keep_finished
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._pump = threading.Thread(target=self._pump_events, daemon=True)
+        self._pump.start()
+
+    @staticmethod
+    def cache_key(spec):
+        params = {k: v for k, v in spec.items() if k not in ("chunk", "maze", "obstacle")}
+        return content_key(spec["algorithm"], [spec.get("maze"), spec.get("obstacle")], params)
+
+    @staticmethod
+    def cacheable(spec):
+        """An unseeded RRT run is random, so like solve_cache.cached_plan it is never cached."""
+        return spec["algorithm"] != "rrt" or spec.get("seed") is not None
+
+    def submit(self, spec):
+        _check_spec(spec)
+        cached = self._cache.get(self.cache_key(spec)) if self.cacheable(spec) else None
+        job = Job(spec, self._manager.Event())
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+            if cached is not None:
+                job.status = DONE
+                job.result = dict(cached, cached=True)
+                job.events.append(("result", job.result))
+                return job
+        job.future = self._pool.submit(_run_job, job.id, spec, self._events, job.cancel_event)
+        job.future.add_done_callback(lambda f, job=job: self._crashed(job, f))
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Ask a job to stop; a job that has not started yet never runs."""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            self._record(job, "status", CANCELLED)
+        return job
+
+    def stream(self, job, start=0, timeout=15.0):
+        """Yield (index, kind, data) for every event from `start` on, until the job finishes."""
+        i = start
+        while True:
+            with self._changed:
+                while i >= len(job.events) and job.status not in FINISHED:
+                    if not self._changed.wait(timeout):
+                        break
+                pending = job.events[i:]
+                finished = job.status in FINISHED
+            if not pending and not finished:
+                yield i, "keepalive", None
+            for kind, data in pending:
+                yield i, kind, data
+                i += 1
+            if finished and i >= len(job.events):
+                return
+
+    def _pump_events(self):
+        while True:
+            item = self._events.get()
+            if item is None:
+                return
+            job_id, kind, data = item
+            job = self.get(job_id)
+            if job is not None:
+                self._record(job, kind, data)
+
+    def _record(self, job, kind, data):
+        with self._changed:
+            if job.status in FINISHED:
+                return
+            if kind == "status":
+                job.status = data
+            elif kind == "result":
+                job.status, job.result = DONE, data
+            elif kind == "error":
+                job.status, job.error = FAILED, data
+            job.events.append((kind, data))
+            self._changed.notify_all()
+        if kind == "result" and self.cacheable(job.spec):
+            self._cache.put(self.cache_key(job.spec), data)
+
+    def _crashed(self, job, future):
+        # Normal endings arrive as events; this only catches a worker dying outright.
+        if not future.cancelled() and future.exception() is not None:
+            self._record(job, "error", repr(future.exception()))
+
+    def _evict(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED]
+        for job_id in finished[:max(0, len(finished) - self._keep_finished)]:
+            del self._jobs[job_id]
+
+    def shutdown(self):
+        for job in list(self._jobs.values()):
+            job.cancel_event.set()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._events.put(None)
+        self._pump.join()
+        self._manager.shutdown()
+
+
+def create_app(manager=None):
+    """Flask app exposing the JobManager over JSON and server-sent events."""
+    app = Flask(__name__)
+    CORS(app)
+    app.config["jobs"] = manager = manager or JobManager()
+
+    @app.post("/api/jobs")
+    def submit_job():
+        spec = request.get_json(force=True)
+        if not isinstance(spec, dict):
+            return jsonify({"error": "Request body must be a JSON object"}), 400
+        try:
+            job = manager.submit(spec)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        return jsonify(job.summary()), 202
+
+    @app.get("/api/jobs/<job_id>")
+    def job_status(job_id):
+        job = manager.get(job_id) or abort(404)
+        return jsonify(job.summary())
+
+    @app.route("/api/jobs/<job_id>", methods=["DELETE"])
+    def cancel_job(job_id):
+        job = manager.cancel(job_id) or abort(404)
+        return jsonify(job.summary())
+
+    @app.get("/api/jobs/<job_id>/events")
+    def job_events(job_id):
+        job = manager.get(job_id) or abort(404)
+        try:
+            start = int(request.headers.get("Last-Event-ID", -1)) + 1
+        except ValueError:
+            return jsonify({"error": "Last-Event-ID must be an integer"}), 400
+
+        def events():
+            for i, kind, data in manager.stream(job, start):
+                if kind == "keepalive":
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"id: {i}\nevent: {kind}\ndata: {json.dumps(data)}\n\n"
+
+        return Response(events(), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    return app
+
+
+def load_test(base_url="http://127.0.0.1:5000", clients=16, jobs_per_client=4, size=101, algorithm="bfs"):
+    """
+    Hit a running server with `clients` concurrent clients, each submitting jobs and
+    reading their event streams to the end. Returns latency figures in seconds.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from urllib.request import Request, urlopen
+
+    from part2 import flood_maze
+
+    counter = itertools.count()
+
+    def one_job():
+        seed = next(counter)
+        if algorithm == "bfs":
+            spec = {"algorithm": "bfs", "maze": flood_maze(size, size, seed=seed).tolist(),
+                    "start": [0, 0], "goal": [size - 1, size - 1]}
+        else:
+            spec = {"algorithm": "rrt", "start": [0.5, 9.5], "goal": [9.5, 0.5], "seed": seed}
+        t0 = time.perf_counter()
+        req = Request(f"{base_url}/api/jobs", data=json.dumps(spec).encode(),
+                      headers={"Content-Type": "application/json"})
+        with urlopen(req) as resp:
+            job = json.load(resp)
+        chunks = 0
+        with urlopen(f"{base_url}/api/jobs/{job['id']}/events") as resp:
+            for line in resp:
+                if line.startswith(b"event: progress"):
+                    chunks += 1
+        return time.perf_counter() - t0, chunks
+
+    def client(_):
+        return [one_job() for _ in range(jobs_per_client)]
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        runs = [run for batch in pool.map(client, range(clients)) for run in batch]
+    latencies = sorted(t for t, _ in runs)
+    return {
+        "jobs": len(runs),
+        "wall": time.perf_counter() - t0,
+        "median": latencies[len(latencies) // 2],
+        "p95": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "chunks": sum(c for _, c in runs),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maze solver backend.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-dir", help="also keep solve results on disk here, across restarts")
+    parser.add_argument("--load-test", type=int, metavar="CLIENTS",
+                        help="instead of serving, load-test a running server with this many clients")
+    args = parser.parse_args()
+    if args.load_test:
+        print(load_test(f"http://{args.host}:{args.port}", clients=args.load_test))
+    else:
+        create_app(JobManager(args.workers, cache_dir=args.cache_dir)).run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,164 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from part2 import flood_maze
+
+MAGIC = b"MAZ1"
+HEADER = np.dtype([
+    ("magic", "S4"),
+    ("rows", "<u4"),
+    ("cols", "<u4"),
+    ("seed", "<i8"),
+    ("start", "<i4", 2),
+    ("goal", "<i4", 2),
+])
+# Header is padded so the packed rows start on a 64-byte boundary.
+HEADER_SIZE = 64
+
+
+class PackedRow:
+    """One row of a PackedMaze, indexable by column like a row of the nested-list mazes."""
+
+    __slots__ = ("_bytes", "_cols")
+
+    def __init__(self, data, cols):
+        self._bytes = data
+        self._cols = cols
+
+    def __len__(self):
+        return self._cols
+
+    def __getitem__(self, c):
+        if not 0 <= c < self._cols:
+            raise IndexError(c)
+        return (self._bytes[c >> 3] >> (7 - (c & 7))) & 1
+
+
+class PackedMaze:
+    """A maze stored 1 bit per cell (1 = wall), rows padded to whole bytes.
+
+    `bits` is usually a read-only numpy.memmap of a corpus file, so loading
+    costs nothing until cells are touched. maze[r][c] works like the nested
+    lists BFS expects, and np.asarray(maze) unpacks to a uint8 grid in one
+    vectorized call, which is what GridBFS, DistanceField and the grid
+    solvers use.
+    """
+
+    def __init__(self, bits, rows, cols, seed=-1, start=(0, 0), goal=(0, 0), path=None):
+        self.bits = bits
+        self.rows = rows
+        self.cols = cols
+        self.seed = seed
+        self.start = tuple(start)
+        self.goal = tuple(goal)
+        self.path = path
+
+    @classmethod
+    def pack(cls, maze, seed=-1, start=(0, 0), goal=None):
+        grid = np.asarray(maze) != 0
+        rows, cols = grid.shape
+        goal = (rows - 1, cols - 1) if goal is None else goal
+        return cls(np.packbits(grid, axis=1), rows, cols, seed, start, goal)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, r):
+        if not 0 <= r < self.rows:
+            raise IndexError(r)
+        return PackedRow(memoryview(self.bits[r]), self.cols)
+
+    def __array__(self, dtype=None, copy=None):
+        grid = np.unpackbits(self.bits, axis=1, count=self.cols)
+        return grid if dtype is None else grid.astype(dtype, copy=False)
+
+    def unpack(self):
+        return np.asarray(self)
+
+    def header(self):
+        head = np.zeros(1, dtype=HEADER)
+        head["magic"] = MAGIC
+        head["rows"], head["cols"], head["seed"] = self.rows, self.cols, self.seed
+        head["start"], head["goal"] = self.start, self.goal
+        return head.tobytes().ljust(HEADER_SIZE, b"\0")
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.header())
+            f.write(np.ascontiguousarray(self.bits, dtype=np.uint8).tobytes())
+
+
+def load_maze(path):
+    """Map a corpus file as a PackedMaze without reading the cell data."""
+    with open(path, "rb") as f:
+        head = np.frombuffer(f.read(HEADER.itemsize), dtype=HEADER)[0]
+    if head["magic"] != MAGIC:
+        raise ValueError(f"{path} is not a packed maze file")
+    rows, cols = int(head["rows"]), int(head["cols"])
+    bits = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER_SIZE, shape=(rows, (cols + 7) // 8))
+    return PackedMaze(bits, rows, cols, int(head["seed"]), head["start"].tolist(), head["goal"].tolist(), path)
+
+
+def load_corpus(directory):
+    """Every maze file in directory, sorted by name."""
+    return [load_maze(os.path.join(directory, name))
+            for name in sorted(os.listdir(directory)) if name.endswith(".maze")]
+
+
+def maze_name(width, height, seed):
+    return f"maze_{width}x{height}_{seed:08d}.maze"
+
+
+def _build_maze(directory, width, height, seed):
+    # flood_maze carves every cell with even coordinates, so both corners below are open.
+    maze = flood_maze(width, height, seed=seed)
+    goal = (height - 1 - (height - 1) % 2, width - 1 - (width - 1) % 2)
+    path = os.path.join(directory, maze_name(width, height, seed))
+    PackedMaze.pack(maze, seed, (0, 0), goal).save(path)
+    return path
+
+
+def generate_corpus(directory, sizes=((20, 6), (101, 101), (501, 501)), seeds=range(100),
+                    max_workers=None, overwrite=False):
+    """
+    Generate one flood_maze per (size, seed) across a process pool and save each as a packed file.
+
+    sizes holds (width, height) pairs or plain ints for square mazes. Start is
+    (0, 0) and goal the far corner cell, both as (row, col) like BFS uses.
+    Workers write their own files, so only paths cross process boundaries.
+    Existing files are kept unless overwrite is set. Returns the file paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    jobs = []
+    for size in sizes:
+        width, height = (size, size) if isinstance(size, int) else size
+        for seed in seeds:
+            if overwrite or not os.path.exists(os.path.join(directory, maze_name(width, height, seed))):
+                jobs.append((width, height, seed))
+    if jobs:
+        max_workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(_build_maze, *zip(*[(directory,) + job for job in jobs]), chunksize=chunksize))
+    return [os.path.join(directory, maze_name(w, h, s))
+            for w, h in [(z, z) if isinstance(z, int) else z for z in sizes] for s in seeds]
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from BFS_mazesolving import BFS, GridBFS
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else "maze_corpus"
+    t0 = time.perf_counter()
+    paths = generate_corpus(directory, sizes=((101, 101), (501, 501)), seeds=range(200))
+    print(f"{len(paths)} mazes in {time.perf_counter() - t0:.2f} s")
+    maze = load_maze(paths[-1])
+    for solver in (BFS, GridBFS):
+        s = solver(maze, maze.start, maze.goal)
+        t0 = time.perf_counter()
+        s.solve()
+        print(f"{solver.__name__:8s} path {len(s.path_result)} cells in {time.perf_counter() - t0:.3f} s")
@@ -0,0 +1,355 @@
+import math
+import numpy as np
+
+
+class PointIndex:
+    """Shared query helpers; subclasses provide add(), nearest() and __len__().
+
+    Spatial structures only store the first of any coincident points (later
+    ones can only lose the lowest-index tie-break); _coincident remembers the
+    rest so radius queries can still report them.
+
+    Up to BROADCAST_MAX points a brute-force distance matrix answers a batch of
+    queries faster than one tree search per query; beyond it the matrix cost
+    grows with the point count and the per-query search wins.
+    """
+
+    BROADCAST_MAX = 1024
+
+    def _register(self, x, y, i):
+        """Record point i; False if it coincides with an earlier point."""
+        first = self._first.setdefault((x, y), i)
+        if first != i:
+            self._coincident.setdefault(first, []).append(i)
+            return False
+        return True
+
+    def nearest_many(self, xs, ys):
+        """nearest() for arrays of queries."""
+        nearest = self.nearest
+        return np.fromiter((nearest(x, y) for x, y in zip(np.asarray(xs, dtype=float).tolist(),
+                                                          np.asarray(ys, dtype=float).tolist())),
+                           dtype=np.int64, count=len(xs))
+
+
+class LinearIndex(PointIndex):
+    """Brute-force nearest neighbor over every point (the original behaviour)."""
+
+    def __init__(self, capacity=1024):
+        self._xs = np.empty(capacity)
+        self._ys = np.empty(capacity)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    def add(self, x, y):
+        """Append a point and return its index."""
+        if self._n == len(self._xs):
+            self._xs = np.resize(self._xs, 2 * len(self._xs))
+            self._ys = np.resize(self._ys, 2 * len(self._ys))
+        self._xs[self._n] = x
+        self._ys[self._n] = y
+        self._n += 1
+        return self._n - 1
+
+    def nearest(self, x, y):
+        """Index of the closest point (lowest index wins ties)."""
+        dx = self._xs[:self._n] - x
+        dy = self._ys[:self._n] - y
+        return int(np.argmin(dx * dx + dy * dy))
+
+    def within(self, x, y, radius):
+        """Sorted indices of every point within radius of (x, y)."""
+        dx = self._xs[:self._n] - x
+        dy = self._ys[:self._n] - y
+        return np.flatnonzero(dx * dx + dy * dy <= radius * radius)
+
+    def nearest_many(self, xs, ys, max_cells=1 << 20):
+        """nearest() for arrays of queries, as one broadcast distance matrix per chunk."""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        px = self._xs[:self._n]
+        py = self._ys[:self._n]
+        out = np.empty(len(xs), dtype=np.int64)
+        chunk = max(1, max_cells // max(1, self._n))
+        for lo in range(0, len(xs), chunk):
+            dx = px - xs[lo:lo + chunk, None]
+            dy = py - ys[lo:lo + chunk, None]
+            out[lo:lo + chunk] = np.argmin(dx * dx + dy * dy, axis=1)
+        return out
+
+
+class GridIndex(PointIndex):
+    """Uniform bucket grid; nearest queries search rings of cells outward.
+
+    Queries far from every point would walk many empty cells, so once the
+    cells visited outnumber the points a vectorised scan takes over.
+    """
+
+    SCAN_RATIO = 32
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self._buckets = {}
+        self._xs = []
+        self._ys = []
+        self._linear = LinearIndex()
+        self._first = {}
+        self._coincident = {}
+        self._bounds = None  # (min_cx, max_cx, min_cy, max_cy) of occupied cells
+
+    def __len__(self):
+        return len(self._xs)
+
+    def _cell(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def add(self, x, y):
+        """Append a point and return its index."""
+        i = len(self._xs)
+        self._xs.append(x)
+        self._ys.append(y)
+        self._linear.add(x, y)
+        if not self._register(x, y, i):
+            return i
+        cx, cy = self._cell(x, y)
+        self._buckets.setdefault((cx, cy), []).append(i)
+        if self._bounds is None:
+            self._bounds = (cx, cx, cy, cy)
+        else:
+            x0, x1, y0, y1 = self._bounds
+            self._bounds = (min(x0, cx), max(x1, cx), min(y0, cy), max(y1, cy))
+        return i
+
+    def _ring(self, cx, cy, k):
+        """Occupied-bounds-clipped cells at Chebyshev distance k from (cx, cy)."""
+        if k == 0:
+            yield (cx, cy)
+            return
+        x0, x1, y0, y1 = self._bounds
+        lo_x, hi_x = max(cx - k, x0), min(cx + k, x1)
+        for y in (cy - k, cy + k):
+            if y0 <= y <= y1:
+                for x in range(lo_x, hi_x + 1):
+                    yield (x, y)
+        lo_y, hi_y = max(cy - k + 1, y0), min(cy + k - 1, y1)
+        for x in (cx - k, cx + k):
+            if x0 <= x <= x1:
+                for y in range(lo_y, hi_y + 1):
+                    yield (x, y)
+
+    def nearest(self, x, y):
+        """Index of the closest point (lowest index wins ties)."""
+        if not self._xs:
+            raise ValueError("nearest() on an empty index")
+        xs, ys, buckets = self._xs, self._ys, self._buckets
+        cx, cy = self._cell(x, y)
+        x0, x1, y0, y1 = self._bounds
+        max_k = max(cx - x0, x1 - cx, cy - y0, y1 - cy)
+        scan_budget = len(xs) // self.SCAN_RATIO
+        best_d2, best_i = math.inf, -1
+        k = 0
+        while k <= max_k:
+            if (2 * k + 1) ** 2 > scan_budget and k:
+                return self._linear.nearest(x, y)
+            for cell in self._ring(cx, cy, k):
+                for i in buckets.get(cell, ()):
+                    dx = xs[i] - x
+                    dy = ys[i] - y
+                    d2 = dx * dx + dy * dy
+                    if d2 < best_d2 or (d2 == best_d2 and i < best_i):
+                        best_d2, best_i = d2, i
+            # Cells in ring k + 1 are at least k cells away from the query;
+            # keep going while they could still hold an equal-or-closer point.
+            reach = k * self.cell_size
+            if best_i >= 0 and reach * reach > best_d2 * (1 + 1e-9):
+                break
+            k += 1
+        return best_i
+
+    def nearest_many(self, xs, ys):
+        """nearest() for arrays of queries; small indices use one broadcast over the shadow LinearIndex."""
+        if len(self) <= self.BROADCAST_MAX:
+            return self._linear.nearest_many(xs, ys)
+        return super().nearest_many(xs, ys)
+
+    def within(self, x, y, radius):
+        """Sorted indices of every point within radius of (x, y)."""
+        if not self._xs:
+            return np.empty(0, dtype=np.int64)
+        x0, x1, y0, y1 = self._bounds
+        lo_x, hi_x = max(math.floor((x - radius) / self.cell_size), x0), min(math.floor((x + radius) / self.cell_size), x1)
+        lo_y, hi_y = max(math.floor((y - radius) / self.cell_size), y0), min(math.floor((y + radius) / self.cell_size), y1)
+        if (hi_x - lo_x + 1) * (hi_y - lo_y + 1) > len(self._xs) // self.SCAN_RATIO + 9:
+            return self._linear.within(x, y, radius)
+        xs, ys, buckets, coincident = self._xs, self._ys, self._buckets, self._coincident
+        r2 = radius * radius
+        found = []
+        for cx in range(lo_x, hi_x + 1):
+            for cy in range(lo_y, hi_y + 1):
+                for i in buckets.get((cx, cy), ()):
+                    dx = xs[i] - x
+                    dy = ys[i] - y
+                    if dx * dx + dy * dy <= r2:
+                        found.append(i)
+                        found.extend(coincident.get(i, ()))
+        found.sort()
+        return np.array(found, dtype=np.int64)
+
+
+class KDTreeIndex(PointIndex):
+    """Static KD-tree over older points plus a linearly scanned insert buffer.
+
+    The tree is rebuilt from scratch whenever the buffer outgrows a fraction of
+    the tree, which keeps both the buffer scan and the rebuild cost amortised.
+    """
+
+    LEAF_SIZE = 16
+
+    def __init__(self, min_rebuild=256, rebuild_fraction=8):
+        self._points = LinearIndex()
+        self._tree_size = 0
+        self._min_rebuild = min_rebuild
+        self._rebuild_fraction = rebuild_fraction
+        self._first = {}
+        self._coincident = {}
+        self._unique = []
+        self._nodes = []
+        self._perm = None
+        self._px = self._py = None
+
+    def __len__(self):
+        return len(self._points)
+
+    def add(self, x, y):
+        """Append a point and return its index."""
+        i = self._points.add(x, y)
+        if self._register(x, y, i):
+            self._unique.append(i)
+        buffered = len(self._points) - self._tree_size
+        if buffered > max(self._min_rebuild, self._tree_size // self._rebuild_fraction):
+            self._rebuild()
+        return i
+
+    def _rebuild(self):
+        n = len(self._points)
+        xs = self._points._xs[:n].copy()
+        ys = self._points._ys[:n].copy()
+        perm = np.array(self._unique, dtype=np.int64)
+        # Each node is [dim, split, left, right, start, end]; leaves have dim -1.
+        nodes = [None]
+        stack = [(0, 0, len(perm))]
+        while stack:
+            slot, start, end = stack.pop()
+            if end - start <= self.LEAF_SIZE:
+                nodes[slot] = (-1, 0.0, -1, -1, start, end)
+                continue
+            idx = perm[start:end]
+            px, py = xs[idx], ys[idx]
+            dim = 0 if np.ptp(px) >= np.ptp(py) else 1
+            vals = px if dim == 0 else py
+            mid = (end - start) // 2
+            order = np.argpartition(vals, mid)
+            perm[start:end] = idx[order]
+            split = vals[order[mid]]
+            left, right = len(nodes), len(nodes) + 1
+            nodes.extend((None, None))
+            nodes[slot] = (dim, float(split), left, right, start, end)
+            stack.append((left, start, start + mid))
+            stack.append((right, start + mid, end))
+        self._nodes = nodes
+        self._perm = perm
+        self._px = xs[perm]
+        self._py = ys[perm]
+        self._tree_size = n
+
+    def nearest(self, x, y):
+        """Index of the closest point (lowest index wins ties)."""
+        n = len(self._points)
+        if n == 0:
+            raise ValueError("nearest() on an empty index")
+        best_d2, best_i = math.inf, -1
+
+        if self._tree_size:
+            q = (x, y)
+            nodes, perm, px, py = self._nodes, self._perm, self._px, self._py
+            stack = [(0, 0.0)]
+            while stack:
+                slot, bound = stack.pop()
+                if bound > best_d2:
+                    continue
+                dim, split, left, right, start, end = nodes[slot]
+                if dim < 0:
+                    dx = px[start:end] - x
+                    dy = py[start:end] - y
+                    d2 = dx * dx + dy * dy
+                    j = int(np.argmin(d2))
+                    md = float(d2[j])
+                    if md <= best_d2:
+                        i = int(perm[start:end][d2 == md].min())
+                        if md < best_d2 or i < best_i:
+                            best_d2, best_i = md, i
+                    continue
+                diff = q[dim] - split
+                near, far = (left, right) if diff < 0 else (right, left)
+                stack.append((far, diff * diff))
+                stack.append((near, bound))
+
+        if n > self._tree_size:
+            dx = self._points._xs[self._tree_size:n] - x
+            dy = self._points._ys[self._tree_size:n] - y
+            d2 = dx * dx + dy * dy
+            j = int(np.argmin(d2))
+            # Buffered points always carry higher indices than tree points.
+            if d2[j] < best_d2:
+                best_d2, best_i = float(d2[j]), self._tree_size + j
+        return best_i
+
+    def nearest_many(self, xs, ys):
+        """nearest() for arrays of queries; small indices use one broadcast over every point."""
+        if len(self) <= self.BROADCAST_MAX:
+            return self._points.nearest_many(xs, ys)
+        return super().nearest_many(xs, ys)
+
+    def within(self, x, y, radius):
+        """Sorted indices of every point within radius of (x, y)."""
+        n, m = len(self._points), self._tree_size
+        r2 = radius * radius
+        found = []
+        if m:
+            q = (x, y)
+            nodes, perm, px, py = self._nodes, self._perm, self._px, self._py
+            stack = [0]
+            while stack:
+                dim, split, left, right, start, end = nodes[stack.pop()]
+                if dim < 0:
+                    dx = px[start:end] - x
+                    dy = py[start:end] - y
+                    found.extend(perm[start:end][dx * dx + dy * dy <= r2].tolist())
+                    continue
+                diff = q[dim] - split
+                if diff - radius <= 0:
+                    stack.append(left)
+                if diff + radius >= 0:
+                    stack.append(right)
+            coincident = self._coincident
+            # Later copies of tree points that are still in the buffer are found below.
+            found.extend([j for i in found if i in coincident for j in coincident[i] if j < m])
+        if n > m:
+            dx = self._points._xs[m:n] - x
+            dy = self._points._ys[m:n] - y
+            found.extend((np.flatnonzero(dx * dx + dy * dy <= r2) + m).tolist())
+        found.sort()
+        return np.array(found, dtype=np.int64)
+
+
+def make_index(kind, cell_size):
+    """Build a nearest-neighbor index by name: "grid", "kdtree" or "linear"."""
+    if kind == "grid":
+        return GridIndex(cell_size)
+    if kind == "kdtree":
+        return KDTreeIndex()
+    if kind == "linear":
+        return LinearIndex()
+    raise ValueError(f"Unknown nn_index {kind!r}; expected 'grid', 'kdtree' or 'linear'")
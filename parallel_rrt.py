@@ -0,0 +1,103 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from RRT_mazesolving import RRT, Node, Obstacle, default_obstacle, path_length
+from collision import segment_array
+from rrt_connect import RRTConnect
+from rrt_star import RRTStar
+
+PLANNERS = {"rrt": RRT, "rrt_star": RRTStar, "rrt_connect": RRTConnect}
+
+# Per-worker state, set once by _init_worker rather than pickled with every task.
+_worker_obstacle = None
+_worker_stop = None
+
+
+def _init_worker(segments, stop_event):
+    global _worker_obstacle, _worker_stop
+    _worker_obstacle = Obstacle([((ax, ay), (bx, by)) for ax, ay, bx, by in segments.tolist()])
+    _worker_stop = stop_event
+
+
+def _run_planner(planner, start, goal, map_size, seed, max_iter, chunk, stop_on_success, kwargs):
+    """Run one seeded planner in chunks of `chunk` iterations, giving up early once another run wins."""
+    rrt = PLANNERS[planner](Node(*start), Node(*goal), map_size, obstacle=_worker_obstacle,
+                            iter=chunk, seed=seed, **kwargs)
+    # RRT* keeps improving its path after the first solution unless we race for it.
+    refine = planner == "rrt_star" and not stop_on_success
+    t0 = time.perf_counter()
+    done = 0
+    while done < max_iter and (refine or not rrt._goal_reached) and not _worker_stop.is_set():
+        rrt._max_iter = min(chunk, max_iter - done)
+        done += rrt._max_iter
+        rrt.plan()
+    if rrt._goal_reached and stop_on_success:
+        _worker_stop.set()
+    return {
+        "seed": seed,
+        "goal_reached": rrt._goal_reached,
+        "path": rrt._path,
+        "path_length": path_length(rrt._path) if rrt._path else None,
+        "iterations": rrt._iterations,
+        "nodes": len(rrt._node_list),
+        "time": time.perf_counter() - t0,
+    }
+
+
+def parallel_plan(start, goal, map_size, obstacle=None, seeds=range(8), mode="first", planner="rrt",
+                  max_iter=50000, chunk=500, max_workers=None, **planner_kwargs):
+    """
+    Run one independently seeded planner per seed across a process pool.
+
+    mode="first" returns the first run that reaches the goal and stops the rest;
+    mode="best" waits for every run and returns the one with the shortest path.
+    The obstacle walls go to each worker once, through the pool initializer.
+    Returns a dict with the winning run under "best" (None if no run succeeded)
+    and every finished run under "runs".
+    """
+    if mode not in ("first", "best"):
+        raise ValueError(f"Unknown mode {mode!r}; expected 'first' or 'best'")
+    obstacle = default_obstacle() if obstacle is None else obstacle
+    seeds = list(seeds)
+    start = (start.x, start.y) if hasattr(start, "x") else tuple(start)
+    goal = (goal.x, goal.y) if hasattr(goal, "x") else tuple(goal)
+    ctx = multiprocessing.get_context()
+    stop_event = ctx.Event()
+    max_workers = max_workers or min(len(seeds), os.cpu_count() or 1)
+
+    t0 = time.perf_counter()
+    runs = []
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(segment_array(obstacle), stop_event)) as pool:
+        pending = {pool.submit(_run_planner, planner, start, goal, map_size, seed, max_iter, chunk,
+                               mode == "first", planner_kwargs) for seed in seeds}
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            runs.extend(f.result() for f in finished)
+            if mode == "first" and any(r["goal_reached"] for r in runs):
+                stop_event.set()
+                for f in pending:
+                    f.cancel()
+                # Runs already in flight notice the stop flag within one chunk.
+                runs.extend(f.result() for f in pending if not f.cancelled())
+                break
+
+    solved = [r for r in runs if r["goal_reached"]]
+    if not solved:
+        best = None
+    elif mode == "first":
+        best = solved[0]
+    else:
+        best = min(solved, key=lambda r: r["path_length"])
+    return {"best": best, "runs": runs, "time": time.perf_counter() - t0}
+
+
+if __name__ == "__main__":
+    for mode in ("first", "best"):
+        result = parallel_plan(Node(0.5, 9.5), Node(10, 0), 10, step_size=0.3, mode=mode)
+        best = result["best"]
+        print(f"{mode:5s}: {len(result['runs'])} runs in {result['time']:.2f} s; "
+              f"winner seed {best['seed'] if best else None}, "
+              f"path length {best['path_length'] if best else float('nan'):.2f}")
@@ -0,0 +1,212 @@
+import time
+
+import numpy as np
+
+from RRT_mazesolving import path_length
+from collision import SegmentCollider
+from grid_segments import cell_to_point, grid_to_segments
+
+
+def _collider(obstacle):
+    return obstacle if isinstance(obstacle, SegmentCollider) else SegmentCollider(obstacle)
+
+
+def _cumulative(pts):
+    return np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(pts, axis=0).T))))
+
+
+def drop_collinear(path, eps=1e-9):
+    """Remove interior points that lie on the straight line through their neighbours."""
+    pts = np.asarray(path, dtype=float).reshape(-1, 2)
+    if len(pts) < 3:
+        return pts.copy()
+    d0, d1 = pts[1:-1] - pts[:-2], pts[2:] - pts[1:-1]
+    turn = np.abs(d0[:, 0] * d1[:, 1] - d0[:, 1] * d1[:, 0]) > eps
+    back = (d0 * d1).sum(axis=1) < 0
+    return pts[np.concatenate(([True], turn | back, [True]))]
+
+
+def shortcut_greedy(path, obstacle, chunk=64):
+    """
+    From each kept vertex jump to the farthest later vertex it can see in a straight line.
+
+    Whether each vertex can skip its successor is settled for the whole path in
+    one edges_free call first; only vertices that can are scanned further, in
+    batches of `chunk` candidate edges, moving on to the next batch only while
+    the current one still has a visible vertex. Returns an (m, 2) array; the
+    first and last points are kept.
+    """
+    collider = _collider(obstacle)
+    pts = np.asarray(path, dtype=float).reshape(-1, 2)
+    n = len(pts)
+    if n < 3:
+        return pts.copy()
+    skip = collider.edges_free(pts[:-2], pts[2:]).tolist()
+    keep = [0]
+    i = 0
+    while i < n - 1:
+        best = i + 1
+        if i + 2 < n and not skip[i]:
+            keep.append(best)
+            i = best
+            continue
+        for lo in range(i + 2, n, chunk):
+            js = np.arange(lo, min(lo + chunk, n))
+            free = collider.edges_free(np.broadcast_to(pts[i], (len(js), 2)), pts[js])
+            if not free.any():
+                break
+            best = int(js[np.flatnonzero(free)[-1]])
+        keep.append(best)
+        i = best
+    return pts[keep]
+
+
+def shortcut_random(path, obstacle, rounds=30, batch=128, seed=None):
+    """
+    Randomized shortcutting: each round tests `batch` random vertex pairs in one
+    edges_free call and splices in the non-overlapping free shortcuts that save
+    the most length. Returns an (m, 2) array.
+    """
+    collider = _collider(obstacle)
+    rng = np.random.default_rng(seed)
+    pts = np.asarray(path, dtype=float).reshape(-1, 2)
+    for _ in range(rounds):
+        n = len(pts)
+        if n < 3:
+            break
+        i = rng.integers(0, n - 2, size=batch)
+        j = i + 2 + (rng.random(batch) * (n - i - 2)).astype(np.int64)
+        free = collider.edges_free(pts[i], pts[j])
+        along = _cumulative(pts)
+        saved = along[j] - along[i] - np.hypot(*(pts[j] - pts[i]).T)
+        candidates = np.flatnonzero(free & (saved > 1e-9))
+        if not len(candidates):
+            continue
+        keep = np.ones(n, dtype=bool)
+        taken = np.zeros(n, dtype=bool)
+        for k in candidates[np.argsort(-saved[candidates])].tolist():
+            a, b = int(i[k]), int(j[k])
+            if taken[a:b + 1].any():
+                continue
+            # Endpoints stay shared with neighbouring shortcuts; only interiors must be disjoint.
+            taken[a + 1:b] = True
+            keep[a + 1:b] = False
+        pts = pts[keep]
+    return pts
+
+
+def densify(path, spacing):
+    """Insert points along each segment so consecutive points are at most `spacing` apart."""
+    pts = np.asarray(path, dtype=float).reshape(-1, 2)
+    if len(pts) < 2:
+        return pts.copy()
+    seg = np.hypot(*np.diff(pts, axis=0).T)
+    pieces = np.maximum(np.ceil(seg / spacing), 1).astype(np.int64)
+    start = np.repeat(np.arange(len(seg)), pieces)
+    t = (np.arange(int(pieces.sum())) - np.repeat(np.cumsum(pieces) - pieces, pieces)) / np.repeat(pieces, pieces)
+    out = pts[start] + (pts[start + 1] - pts[start]) * t[:, None]
+    return np.vstack((out, pts[-1:]))
+
+
+def chaikin(path, obstacle, iterations=2, ratio=0.25):
+    """
+    Chaikin corner cutting, keeping any corner whose cut would touch a wall.
+
+    Each pass replaces corner P with points at `ratio` along its two edges; the
+    new edges are verified in one edges_free call and corners next to a
+    blocked edge are restored until the whole path is free again.
+    """
+    collider = _collider(obstacle)
+    pts = np.asarray(path, dtype=float).reshape(-1, 2)
+    for _ in range(iterations):
+        n = len(pts)
+        if n < 3:
+            break
+        cut = np.ones(n, dtype=bool)
+        cut[[0, -1]] = False
+        while True:
+            out, owner = [], []
+            for k in range(n):
+                if cut[k]:
+                    out.append(pts[k] + ratio * (pts[k - 1] - pts[k]))
+                    out.append(pts[k] + ratio * (pts[k + 1] - pts[k]))
+                    owner += [k, k]
+                else:
+                    out.append(pts[k])
+                    owner.append(k)
+            out, owner = np.array(out), np.array(owner)
+            free = collider.edges_free(out[:-1], out[1:])
+            if free.all() or not cut.any():
+                break
+            blocked = np.flatnonzero(~free)
+            cut[owner[blocked]] = False
+            cut[owner[blocked + 1]] = False
+        pts = out
+    return pts
+
+
+def smooth_path(path, obstacle, method="greedy", spacing=None, spline=0, seed=None, **kwargs):
+    """
+    Shortcut a path ([[x, y], ...] or an (n, 2) array), then optionally spline and densify it.
+
+    method is "greedy", "random" or "both" (greedy shortcuts on the random
+    result). spline runs that many guarded Chaikin passes; spacing resamples
+    the result. Returns (points as an (m, 2) array, stats dict).
+    """
+    collider = _collider(obstacle)
+    queries = collider.queries
+    t0 = time.perf_counter()
+    pts = np.asarray(path, dtype=float).reshape(-1, 2)
+    before_length, before_points = path_length(pts.tolist()), len(pts)
+    if method not in ("greedy", "random", "both"):
+        raise ValueError(f"Unknown method {method!r}; expected 'greedy', 'random' or 'both'")
+    if method in ("random", "both"):
+        pts = shortcut_random(pts, collider, seed=seed, **kwargs)
+    if method in ("greedy", "both"):
+        pts = shortcut_greedy(pts, collider)
+    if spline:
+        pts = chaikin(pts, collider, spline)
+    if spacing:
+        pts = densify(pts, spacing)
+    return pts, {
+        "length_before": before_length,
+        "length_after": path_length(pts.tolist()),
+        "points_before": before_points,
+        "points_after": len(pts),
+        "edges_checked": collider.queries - queries,
+        "time": time.perf_counter() - t0,
+    }
+
+
+def smooth_grid_path(maze, path, cell_size=1.0, **kwargs):
+    """
+    smooth_path for a BFS path of (row, col) cells: the cells become their centre
+    points and the maze its grid_to_segments walls, so shortcuts never clip a wall
+    cell. Straight runs are collapsed to their end cells before shortcutting;
+    points_before still counts every cell.
+    """
+    rows = len(maze)
+    pts = np.array([cell_to_point(r, c, rows, cell_size) for r, c in path], dtype=float).reshape(-1, 2)
+    smoothed, stats = smooth_path(drop_collinear(pts), grid_to_segments(maze, cell_size), **kwargs)
+    stats["points_before"] = len(pts)
+    return smoothed, stats
+
+
+if __name__ == "__main__":
+    from BFS_mazesolving import GridBFS
+    from RRT_mazesolving import RRT, Node, obs
+    from part2 import flood_maze
+
+    rrt = RRT(Node(0.5, 9.5), Node(9.5, 0.5), 10, obstacle=obs, iter=50000, step_size=0.05, seed=0)
+    rrt.plan()
+    for method in ("greedy", "random", "both"):
+        _, stats = smooth_path(rrt._path, obs, method=method, seed=0)
+        print(f"RRT {method:6s} {stats['points_before']:5d} -> {stats['points_after']:4d} points, "
+              f"length {stats['length_before']:.2f} -> {stats['length_after']:.2f} in {stats['time'] * 1000:.1f} ms")
+
+    maze = flood_maze(301, 301, seed=0)
+    bfs = GridBFS(maze, (0, 0), (300, 300))
+    bfs.solve()
+    _, stats = smooth_grid_path(maze, bfs.path_result)
+    print(f"BFS greedy {stats['points_before']:5d} -> {stats['points_after']:4d} points, "
+          f"length {stats['length_before']:.2f} -> {stats['length_after']:.2f} in {stats['time'] * 1000:.1f} ms")
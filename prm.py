@@ -0,0 +1,237 @@
+import hashlib
+import heapq
+import math
+import time
+
+import numpy as np
+
+from RRT_mazesolving import default_obstacle, path_length
+from collision import SegmentCollider, segment_array
+
+
+def obstacle_fingerprint(obstacle, map_size=None):
+    """Content hash of the wall segments (and map size), used to tell whether a roadmap still applies."""
+    h = hashlib.sha1(np.ascontiguousarray(segment_array(obstacle), dtype=np.float64).tobytes())
+    h.update(repr(map_size).encode())
+    return h.hexdigest()
+
+
+def _k_nearest(points, queries, k, chunk=1024):
+    """Indices (len(queries), k) of the k nearest points to each query, by brute force in chunks."""
+    k = min(k, len(points))
+    out = np.empty((len(queries), k), dtype=np.int64)
+    for lo in range(0, len(queries), chunk):
+        q = queries[lo:lo + chunk]
+        d = ((q[:, None, :] - points[None, :, :]) ** 2).sum(axis=2)
+        out[lo:lo + chunk] = np.argpartition(d, k - 1, axis=1)[:, :k]
+    return out
+
+
+class PRM:
+    """Probabilistic roadmap: a collision-checked graph over the map, built once and queried many times.
+
+    build() samples n_samples points, links each to its k nearest neighbours
+    and keeps the links that edges_free clears, all in one batch. The graph
+    is stored in CSR form (indptr, indices, weights) and can be saved to and
+    loaded from an .npz file. query() links start and goal to the roadmap and
+    runs A* over a binary heap. The roadmap records a fingerprint of the
+    walls it was built for and rebuilds itself when they change.
+    """
+
+    def __init__(self, obstacle=None, map_size=10, n_samples=2000, k=10, max_radius=None, seed=None,
+                 cache_size=256):
+        self.obstacle = default_obstacle() if obstacle is None else obstacle
+        self.map_size = map_size
+        self.n_samples = n_samples
+        self.k = k
+        self.max_radius = max_radius
+        self.seed = seed
+        self.cache_size = cache_size
+        self.points = None
+        self.fingerprint = None
+        self._cache = {}
+        self._collider = None
+        self.build_time = 0.0
+
+    def _params(self):
+        return {"map_size": self.map_size, "n_samples": self.n_samples, "k": self.k,
+                "max_radius": self.max_radius, "seed": self.seed}
+
+    def is_stale(self):
+        return self.points is None or self.fingerprint != obstacle_fingerprint(self.obstacle, self.map_size)
+
+    def build(self):
+        """(Re)build the roadmap for the current obstacle set."""
+        t0 = time.perf_counter()
+        self._collider = SegmentCollider(self.obstacle)
+        rng = np.random.default_rng(self.seed)
+        points = rng.uniform(0, self.map_size, size=(self.n_samples, 2))
+
+        near = _k_nearest(points, points, self.k + 1)
+        a = np.repeat(np.arange(len(points)), near.shape[1])
+        b = near.ravel()
+        # Undirected edges once each, without self-loops.
+        pairs = np.unique(np.column_stack((np.minimum(a, b), np.maximum(a, b)))[a != b], axis=0)
+        length = np.hypot(*(points[pairs[:, 0]] - points[pairs[:, 1]]).T)
+        if self.max_radius is not None:
+            pairs, length = pairs[length <= self.max_radius], length[length <= self.max_radius]
+        free = self._collider.edges_free(points[pairs[:, 0]], points[pairs[:, 1]])
+        self._set_graph(points, pairs[free], length[free])
+        self.fingerprint = obstacle_fingerprint(self.obstacle, self.map_size)
+        self.build_time = time.perf_counter() - t0
+        return self
+
+    def _set_graph(self, points, pairs, length):
+        src = np.concatenate((pairs[:, 0], pairs[:, 1]))
+        dst = np.concatenate((pairs[:, 1], pairs[:, 0]))
+        weight = np.concatenate((length, length))
+        order = np.argsort(src, kind="stable")
+        self.points = points
+        self.indices = dst[order]
+        self.weights = weight[order]
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(src, minlength=len(points)))))
+        self._adjacency = None
+        self._cache.clear()
+
+    def _neighbours(self):
+        """Per-vertex [(neighbour, weight), ...] lists, built lazily for the Python search loop."""
+        if self._adjacency is None:
+            indptr, indices, weights = self.indptr.tolist(), self.indices.tolist(), self.weights.tolist()
+            self._adjacency = [list(zip(indices[indptr[i]:indptr[i + 1]], weights[indptr[i]:indptr[i + 1]]))
+                               for i in range(len(self.points))]
+        return self._adjacency
+
+    @property
+    def n_edges(self):
+        return len(self.indices) // 2 if self.points is not None else 0
+
+    def save(self, path):
+        np.savez_compressed(path, points=self.points, indptr=self.indptr, indices=self.indices,
+                            weights=self.weights, fingerprint=self.fingerprint,
+                            params=repr(sorted(self._params().items())))
+
+    @classmethod
+    def load(cls, path, obstacle=None, **kwargs):
+        """
+        Load a saved roadmap for obstacle. If the file is missing, was built for other
+        walls or other parameters, build a fresh roadmap and save it over the file.
+        """
+        prm = cls(obstacle, **kwargs)
+        obstacle = prm.obstacle
+        try:
+            with np.load(path) as data:
+                fresh = (str(data["fingerprint"]) == obstacle_fingerprint(obstacle, prm.map_size) and
+                         str(data["params"]) == repr(sorted(prm._params().items())))
+                if fresh:
+                    prm.points = data["points"]
+                    prm.indptr, prm.indices, prm.weights = data["indptr"], data["indices"], data["weights"]
+                    prm.fingerprint = str(data["fingerprint"])
+                    prm._adjacency = None
+                    prm._collider = SegmentCollider(obstacle)
+                    return prm
+        except (OSError, KeyError, ValueError):
+            pass
+        prm.build().save(path)
+        return prm
+
+    def _link(self, x, y):
+        """(roadmap vertex, distance) pairs that (x, y) can reach in a straight line among its k nearest."""
+        point = np.array([[x, y]], dtype=float)
+        near = _k_nearest(self.points, point, 2 * self.k)[0]
+        free = self._collider.edges_free(np.repeat(point, len(near), axis=0), self.points[near])
+        near = near[free]
+        dist = np.hypot(*(self.points[near] - point).T)
+        return list(zip(near.tolist(), dist.tolist()))
+
+    def query(self, start, goal):
+        """
+        Shortest roadmap path from start to goal as [[x, y], ...], or None if they are not connected.
+        Accepts Node-like objects or (x, y) pairs; results are cached per (start, goal).
+        """
+        if self.is_stale():
+            self.build()
+        start = (start.x, start.y) if hasattr(start, "x") else tuple(start)
+        goal = (goal.x, goal.y) if hasattr(goal, "x") else tuple(goal)
+        key = (start, goal)
+        if key in self._cache:
+            return self._cache[key]
+
+        if self._collider.is_free(*start, *goal):
+            path = [list(start), list(goal)]
+        else:
+            path = self._search(start, goal)
+        if len(self._cache) >= self.cache_size:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = path
+        return path
+
+    def _search(self, start, goal):
+        pts = self.points.tolist()
+        adjacency = self._neighbours()
+        gx, gy = goal
+        start_links = self._link(*start)
+        goal_links = dict(self._link(*goal))
+        if not start_links or not goal_links:
+            return None
+
+        # Vertex -1 is the start, -2 the goal; A* with the straight-line distance to goal.
+        g = {}
+        parent = {}
+        heap = []
+        for v, d in start_links:
+            if d < g.get(v, math.inf):
+                g[v] = d
+                parent[v] = -1
+                heapq.heappush(heap, (d + math.hypot(pts[v][0] - gx, pts[v][1] - gy), d, v))
+        best_goal, best_via = math.inf, None
+        closed = set()
+        while heap:
+            f, d, v = heapq.heappop(heap)
+            if f >= best_goal:
+                break
+            if v in closed:
+                continue
+            closed.add(v)
+            if v in goal_links and d + goal_links[v] < best_goal:
+                best_goal, best_via = d + goal_links[v], v
+            for u, w in adjacency[v]:
+                nd = d + w
+                if nd < g.get(u, math.inf):
+                    g[u] = nd
+                    parent[u] = v
+                    heapq.heappush(heap, (nd + math.hypot(pts[u][0] - gx, pts[u][1] - gy), nd, u))
+        if best_via is None:
+            return None
+        path = [list(goal)]
+        v = best_via
+        while v != -1:
+            path.append(pts[v])
+            v = parent[v]
+        path.append(list(start))
+        path.reverse()
+        return path
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    from RRT_mazesolving import RRT, Node, obs
+
+    roadmap_file = os.path.join(tempfile.gettempdir(), "prm_default.npz")
+    t0 = time.perf_counter()
+    prm = PRM.load(roadmap_file, obs, n_samples=3000, seed=0)
+    print(f"roadmap ready in {time.perf_counter() - t0:.2f} s: {len(prm.points)} vertices, {prm.n_edges} edges")
+
+    rng = np.random.default_rng(1)
+    queries = [((0.5, 9.5), (9.5, 0.5))] + [(tuple(p), tuple(q)) for p, q in rng.uniform(0, 10, size=(20, 2, 2))]
+    t0 = time.perf_counter()
+    paths = [prm.query(s, g) for s, g in queries]
+    print(f"{len(queries)} queries in {(time.perf_counter() - t0) * 1000:.1f} ms, "
+          f"{sum(p is not None for p in paths)} connected; default maze path length {path_length(paths[0]):.2f}")
+
+    rrt = RRT(Node(0.5, 9.5), Node(9.5, 0.5), 10, obstacle=obs, iter=50000, step_size=0.3, seed=0)
+    t0 = time.perf_counter()
+    rrt.plan()
+    print(f"one RRT.plan for comparison: {(time.perf_counter() - t0) * 1000:.1f} ms, "
+          f"path length {path_length(rrt._path):.2f}")
@@ -0,0 +1,118 @@
+import time
+
+from RRT_mazesolving import RRT, Node, Obstacle
+from nn_index import make_index
+from tree_store import TreeStore
+
+TRAPPED, ADVANCED, REACHED = 0, 1, 2
+
+
+class RRTConnect(RRT):
+    """Bidirectional RRT-Connect: one tree from start, one from goal, greedy connect each step.
+
+    The goal must lie in free space, since the goal tree grows from it.
+    After plan(), _goal_tree holds the second tree and _path runs from start
+    to goal through the point where the two trees met.
+    """
+
+    def __init__(self, start, goal, map_size, *args, nn_index="grid", **kwargs):
+        super().__init__(start, goal, map_size, *args, nn_index=nn_index, **kwargs)
+        self._goal_tree = TreeStore()
+        self._goal_index = make_index(nn_index, self.step_size)
+        self._goal_tree.add(goal.x, goal.y, 0.0, -1)
+        self._goal_index.add(goal.x, goal.y)
+
+    def _sample(self):
+        # Both trees pull toward uniform samples; the goal bias of RRT has no role here.
+        rand = self._random
+        return rand.uniform(0, self._map_size), rand.uniform(0, self._map_size)
+
+    def _extend(self, tree, index, x, y):
+        """One step of tree toward (x, y); returns (status, new vertex or -1)."""
+        nearest = index.nearest(x, y)
+        near_x, near_y = tree.point(nearest)
+        new_x, new_y, cost = self._steer(near_x, near_y, tree.cost.item(nearest), x, y)
+        if not self._collider.is_free(near_x, near_y, new_x, new_y):
+            return TRAPPED, -1
+        index.add(new_x, new_y)
+        new = tree.add(new_x, new_y, cost, nearest)
+        return (REACHED if (new_x, new_y) == (x, y) else ADVANCED), new
+
+    def _connect(self, tree, index, x, y):
+        """Extend tree toward (x, y) until it gets there or is blocked."""
+        status, new = ADVANCED, -1
+        while status == ADVANCED:
+            status, step = self._extend(tree, index, x, y)
+            if step >= 0:
+                new = step
+        return status, new
+
+    def plan(self):
+        """Grow both trees, alternating roles, until a greedy connect joins them."""
+        trees = [(self._tree, self._nn_index), (self._goal_tree, self._goal_index)]
+        for i in range(self._max_iter):
+            (tree_a, index_a), (tree_b, index_b) = trees
+            status, new = self._extend(tree_a, index_a, *self._sample())
+            if status != TRAPPED:
+                status, meet = self._connect(tree_b, index_b, *tree_a.point(new))
+                if status == REACHED:
+                    self._iterations += i + 1
+                    if tree_a is self._tree:
+                        self._splice(new, meet)
+                    else:
+                        self._splice(meet, new)
+                    return
+            trees.reverse()
+        self._iterations += self._max_iter
+
+    def _splice(self, start_vertex, goal_vertex):
+        """Join the start-tree branch and the reversed goal-tree branch at their shared point."""
+        head = self._tree.path_to(start_vertex)
+        tail = self._goal_tree.path_to(goal_vertex)[::-1]
+        self._path = head + tail[1:]
+        self._goal_reached = True
+
+    def visualize(self, title="RRT-Connect Path Planning", **kwargs):
+        """RRT.visualize plus the goal tree."""
+        fig, ax = super().visualize(title=title, **kwargs)
+        if kwargs.get("show_tree", True):
+            from rrt_render import TreeRenderer
+
+            TreeRenderer(ax, self._goal_tree, color='navajowhite', show_nodes=False, alpha=0.8).draw_all()
+        return fig, ax
+
+
+def compare_connect_example(seeds=range(10), iter=50000, step_size=0.3):
+    """
+    Solve the default maze with RRT.plan() and RRTConnect.plan() over the same seeds
+    and report iterations to solution and wall time.
+    """
+    obstacles = Obstacle()
+    obstacles.default()
+    # The example goal (10, 0) sits on the bottom wall; use the middle of the exit cell.
+    start, goal = (0.5, 9.5), (9.5, 0.5)
+
+    results = {}
+    for name, planner in (("RRT", RRT), ("RRT-Connect", RRTConnect)):
+        runs = []
+        for seed in seeds:
+            rrt = planner(start=Node(*start), goal=Node(*goal), map_size=10, obstacle=obstacles,
+                          iter=iter, step_size=step_size, seed=seed)
+            t0 = time.perf_counter()
+            rrt.plan()
+            runs.append((rrt._goal_reached, rrt._iterations, time.perf_counter() - t0))
+        solved = [r for r in runs if r[0]]
+        results[name] = {
+            "solved": len(solved),
+            "runs": len(runs),
+            "mean_iterations": sum(r[1] for r in solved) / max(1, len(solved)),
+            "mean_time": sum(r[2] for r in solved) / max(1, len(solved)),
+        }
+        print(f"{name:12s} solved {len(solved)}/{len(runs)}  "
+              f"mean iterations {results[name]['mean_iterations']:9.1f}  "
+              f"mean time {results[name]['mean_time'] * 1000:8.1f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    compare_connect_example()
@@ -0,0 +1,298 @@
+import os
+import shutil
+import subprocess
+import time
+
+import matplotlib
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.image import imsave
+
+
+def draw_obstacles(ax, obstacle, label="Obstacles"):
+    """All walls as one LineCollection; accepts an Obstacle or a list of ((x1, y1), (x2, y2))."""
+    walls = obstacle.obstacle if hasattr(obstacle, "obstacle") else obstacle
+    walls = np.asarray(walls if walls else np.empty((0, 2, 2)), dtype=float).reshape(-1, 2, 2)
+    lines = LineCollection(walls, colors="k", linewidths=3, label=label)
+    ax.add_collection(lines, autolim=False)
+    return lines
+
+
+def tree_segments(tree, lo=0, hi=None):
+    """(k, 2, 2) parent -> child segments for the non-root vertices lo..hi-1 of a TreeStore."""
+    hi = len(tree) if hi is None else hi
+    child = np.arange(lo, hi)
+    parent = tree.parent[lo:hi]
+    child, parent = child[parent >= 0], parent[parent >= 0]
+    return np.stack(((tree.x[parent], tree.y[parent]), (tree.x[child], tree.y[child]))).transpose(2, 0, 1)
+
+
+class TreeRenderer:
+    """One TreeStore drawn as a single LineCollection plus one scatter, updated in place.
+
+    draw_all() points the collections at every edge and vertex of the tree,
+    for static figures. frame() is for animation: it restores a cached
+    background, draws only the vertices added since the previous frame (two
+    small animated collections), folds them into the background and blits.
+    A frame therefore costs the same with a hundred vertices or a hundred
+    thousand, and no artist is created per vertex. `overlays` are animated
+    artists (markers, status text) redrawn on top of every frame without
+    being folded in. A full redraw of the canvas (e.g. a resize) drops the
+    background; the next frame syncs the collections and takes a new one.
+    """
+
+    def __init__(self, ax, tree, color="lightblue", node_color="lightblue", node_edge="blue",
+                 show_nodes=True, alpha=0.6, label="RRT Nodes"):
+        self.ax = ax
+        self.tree = tree
+        style = {"colors": color, "linewidths": 0.5, "alpha": alpha, "zorder": 1}
+        self.edges = LineCollection([], **style)
+        self._fresh_edges = LineCollection([], animated=True, **style)
+        ax.add_collection(self.edges, autolim=False)
+        ax.add_collection(self._fresh_edges, autolim=False)
+        self.nodes = self._fresh_nodes = None
+        if show_nodes:
+            style = {"c": node_color, "s": 20, "alpha": alpha, "edgecolors": node_edge, "linewidths": 0.5,
+                     "zorder": 2}
+            self.nodes = ax.scatter([], [], label=label, **style)
+            self._fresh_nodes = ax.scatter([], [], animated=True, **style)
+        self._drawn = 0
+        self._background = None
+        ax.figure.canvas.mpl_connect("draw_event", self._invalidate)
+
+    def _invalidate(self, event):
+        self._background = None
+
+    def _points(self, lo, hi):
+        return np.column_stack((self.tree.x[lo:hi], self.tree.y[lo:hi]))
+
+    def draw_all(self):
+        """Point the (non-animated) collections at the whole tree."""
+        n = len(self.tree)
+        self.edges.set_segments(tree_segments(self.tree, 0, n))
+        if self.nodes is not None:
+            self.nodes.set_offsets(self._points(0, n))
+        self._drawn = n
+
+    def frame(self, *overlays):
+        """Draw the vertices added since the last frame, then the overlays, and blit the axes."""
+        ax = self.ax
+        canvas = ax.figure.canvas
+        n = len(self.tree)
+        if self._background is None:
+            self.draw_all()
+            canvas.draw()
+            self._background = canvas.copy_from_bbox(ax.bbox)
+        elif n > self._drawn:
+            canvas.restore_region(self._background)
+            self._fresh_edges.set_segments(tree_segments(self.tree, self._drawn, n))
+            ax.draw_artist(self._fresh_edges)
+            if self._fresh_nodes is not None:
+                self._fresh_nodes.set_offsets(self._points(self._drawn, n))
+                ax.draw_artist(self._fresh_nodes)
+            self._drawn = n
+            self._background = canvas.copy_from_bbox(ax.bbox)
+        else:
+            canvas.restore_region(self._background)
+        for artist in overlays:
+            ax.draw_artist(artist)
+        canvas.blit(ax.bbox)
+
+
+class FrameWriter:
+    """
+    Writes the current pixels of an Agg figure, without redrawing it, either as
+    frame_00000.png, ... into a directory or as an .mp4/.mkv/.webm/.gif through an
+    ffmpeg pipe (the ffmpeg named by rcParams["animation.ffmpeg_path"]).
+    """
+
+    VIDEO = (".mp4", ".mkv", ".webm", ".gif")
+
+    def __init__(self, fig, path, fps=30):
+        self.fig = fig
+        self.path = path
+        self.frames = 0
+        self._proc = None
+        if path.lower().endswith(self.VIDEO):
+            ffmpeg = shutil.which(matplotlib.rcParams["animation.ffmpeg_path"])
+            if ffmpeg is None:
+                raise RuntimeError("ffmpeg not found; pass a directory to write PNG frames instead")
+            fig.canvas.draw()
+            width, height = fig.canvas.get_width_height()
+            cmd = [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba",
+                   "-s", f"{width}x{height}", "-r", str(fps), "-i", "-"]
+            if not path.lower().endswith(".gif"):
+                # yuv420p (what players expect) needs even dimensions.
+                cmd += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p"]
+            self._proc = subprocess.Popen(cmd + [path], stdin=subprocess.PIPE)
+        else:
+            os.makedirs(path, exist_ok=True)
+
+    def write(self):
+        pixels = np.asarray(self.fig.canvas.buffer_rgba())
+        if self._proc is not None:
+            self._proc.stdin.write(pixels.tobytes())
+        else:
+            imsave(os.path.join(self.path, f"frame_{self.frames:05d}.png"), pixels)
+        self.frames += 1
+
+    def close(self):
+        if self._proc is not None:
+            self._proc.stdin.close()
+            if self._proc.wait():
+                raise RuntimeError(f"ffmpeg exited with status {self._proc.returncode}")
+            self._proc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def animate(planner, step=10, title="RRT Path Planning Animation", figsize=(10, 10), out=None, fps=30,
+            pause=0.01):
+    """
+    Run planner.plan() a few iterations at a time and show a frame whenever the tree
+    has grown by `step` vertices, up to the planner's iteration budget.
+
+    With out=None the frames are blitted to a pyplot window. With out set to a
+    directory or a video file name the figure is a bare Agg canvas (pyplot is not
+    touched) and every frame is written there by FrameWriter. Returns (fig, ax).
+    """
+    if out is None:
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots(figsize=figsize)
+    else:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+
+    size = planner._map_size
+    ax.set_xlim(-1, size + 1)
+    ax.set_ylim(-1, size + 1)
+    ax.set_aspect("equal")
+    ax.grid(True, alpha=0.3, linestyle="--")
+    ax.set_xlabel("X", fontsize=12)
+    ax.set_ylabel("Y", fontsize=12)
+    ax.set_title(title, fontsize=14, fontweight="bold")
+    draw_obstacles(ax, planner._obstacle, label=None)
+    renderer = TreeRenderer(ax, planner._tree)
+    start, goal = planner._start, planner._goal
+    # Markers stay on top of the tree, so they are redrawn every frame rather than folded in.
+    overlays = [
+        ax.scatter(start.x, start.y, c="green", s=200, marker="o", edgecolors="darkgreen", linewidths=2,
+                   zorder=7, label="Start", animated=True),
+        ax.scatter(goal.x, goal.y, c="red", s=200, marker="*", edgecolors="darkred", linewidths=2,
+                   zorder=7, label="Goal", animated=True),
+        ax.text(0.02, 0.98, "", transform=ax.transAxes, fontsize=10, verticalalignment="top",
+                bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.8), animated=True),
+    ]
+    status = overlays[-1]
+    ax.legend(loc="upper right", fontsize=10)
+    fig.tight_layout()
+
+    writer = FrameWriter(fig, out, fps) if out is not None else None
+    tree = planner._tree
+    budget = planner._iterations + planner._max_iter
+    chunk = planner._max_iter
+    shown = len(tree)
+    try:
+        while planner._iterations < budget and not planner._goal_reached:
+            planner._max_iter = min(step, budget - planner._iterations)
+            planner.plan()
+            if len(tree) - shown < step and not planner._goal_reached:
+                continue
+            shown = len(tree)
+            status.set_text(f"Iteration {planner._iterations}\nNodes: {shown}")
+            renderer.frame(*overlays)
+            if writer is not None:
+                writer.write()
+            else:
+                plt.pause(pause)
+    finally:
+        planner._max_iter = chunk
+
+    for artist in overlays:
+        artist.set_animated(False)
+    renderer.draw_all()
+    if planner._goal_reached:
+        path = np.asarray(planner._path)
+        ax.plot(path[:, 0], path[:, 1], "r-", linewidth=3, zorder=5, label="Final Path")
+        ax.scatter(path[:, 0], path[:, 1], c="red", s=50, zorder=6, edgecolors="darkred", linewidths=1.5)
+        ax.set_title(f"{title} - Goal Reached! Iteration {planner._iterations}",
+                     fontsize=14, fontweight="bold", color="green")
+        ax.legend(loc="upper right", fontsize=10)
+    status.set_text(f"Iteration {planner._iterations}\nNodes: {len(tree)}")
+    if writer is not None:
+        fig.canvas.draw()
+        writer.write()
+        writer.close()
+    else:
+        plt.pause(0.1)
+    return fig, ax
+
+
+def benchmark_frames(nodes=50000, step=500, seed=0, figsize=(8, 8)):
+    """
+    Per-frame time of TreeRenderer.frame on an off-screen figure as a random tree
+    grows to `nodes` vertices, `step` at a time, against a full canvas.draw() of the
+    same tree as one collection and (up to 5000 vertices) as one ax.plot per edge.
+    """
+    from tree_store import TreeStore
+
+    rng = np.random.default_rng(seed)
+    tree = TreeStore()
+    tree.add(5.0, 5.0)
+
+    def grow(k):
+        for _ in range(k):
+            p = int(rng.integers(len(tree)))
+            x, y = tree.point(p)
+            tree.add(min(max(x + rng.normal(0, 0.2), 0), 10), min(max(y + rng.normal(0, 0.2), 0), 10), 0.0, p)
+
+    def figure():
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.set_xlim(-1, 11)
+        ax.set_ylim(-1, 11)
+        return fig, ax
+
+    fig, ax = figure()
+    renderer = TreeRenderer(ax, tree)
+    renderer.frame()
+    rows = []
+    frames = 0
+    while len(tree) < nodes:
+        grow(step)
+        t0 = time.perf_counter()
+        renderer.frame()
+        blit = time.perf_counter() - t0
+        frames += 1
+        if frames % 10 and frames > 1:
+            continue
+        full_fig, full_ax = figure()
+        TreeRenderer(full_ax, tree).draw_all()
+        t0 = time.perf_counter()
+        full_fig.canvas.draw()
+        row = {"nodes": len(tree), "blit": blit, "collection_redraw": time.perf_counter() - t0}
+        if len(tree) <= 5000:
+            plot_fig, plot_ax = figure()
+            t0 = time.perf_counter()
+            for (px, py), (x, y) in tree_segments(tree):
+                plot_ax.plot([px, x], [py, y], "lightblue", linewidth=0.5, alpha=0.6)
+            plot_fig.canvas.draw()
+            row["per_edge_plot"] = time.perf_counter() - t0
+        rows.append(row)
+    return rows
+
+
+if __name__ == "__main__":
+    for row in benchmark_frames():
+        extra = f"  ax.plot per edge {row['per_edge_plot'] * 1000:8.1f} ms" if "per_edge_plot" in row else ""
+        print(f"{row['nodes']:6d} nodes: blit frame {row['blit'] * 1000:6.2f} ms  "
+              f"full redraw {row['collection_redraw'] * 1000:7.1f} ms{extra}")
@@ -0,0 +1,130 @@
+import math
+import time
+import numpy as np
+
+from RRT_mazesolving import RRT
+
+
+class RRTStar(RRT):
+    """RRT* on top of RRT: choose-parent and rewiring inside a shrinking radius.
+
+    The neighbourhood radius is min(gamma * sqrt(log n / n), max_radius), found
+    through the RRT's nearest-neighbor index. Planning keeps refining after the
+    first solution until the iteration budget (iter) or time_budget runs out;
+    _path is the cheapest branch that ends within step_size of the goal, and
+    cost_history records (iteration, cost) every time that cost improves.
+    """
+
+    def __init__(self, *args, gamma=None, max_radius=None, time_budget=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if gamma is None:
+            # Lower bound for asymptotic optimality in 2-D, using the map area as free space.
+            gamma = 2 * math.sqrt(1.5) * math.sqrt(self._map_size ** 2 / math.pi)
+        self.gamma = gamma
+        self.max_radius = 2 * self.step_size if max_radius is None else max_radius
+        self.time_budget = time_budget
+        self._children = [[]]
+        self._goal_nodes = []
+        self._best_goal = -1
+        self.cost_history = []
+
+    def _sample(self):
+        # RRT samples integer lattice points, which RRT* would saturate long
+        # before the cost converges; sample the map continuously instead.
+        rand = self._random
+        if rand.random() <= 0.7:
+            return rand.uniform(0, self._map_size), rand.uniform(0, self._map_size)
+        return self._goal.x, self._goal.y
+
+    def _radius(self):
+        n = len(self._tree)
+        if n < 2:
+            return self.max_radius
+        return min(self.gamma * math.sqrt(math.log(n) / n), self.max_radius)
+
+    def _add(self, x, y, cost, parent):
+        i = super()._add(x, y, cost, parent)
+        if i:
+            self._children.append([])
+            self._children[parent].append(i)
+        return i
+
+    def _propagate(self, root, delta):
+        """Shift the cost of every descendant of root by delta."""
+        cost, children = self._tree.cost, self._children
+        stack = list(children[root])
+        while stack:
+            i = stack.pop()
+            cost[i] += delta
+            stack.extend(children[i])
+
+    def _rewire(self, new, near, dist, free):
+        """Reparent neighbours that become cheaper when reached through new."""
+        tree, children = self._tree, self._children
+        through_new = tree.cost.item(new) + dist
+        better = free & (through_new < tree.cost[near])
+        for i, c in zip(near[better].tolist(), through_new[better].tolist()):
+            children[tree.parent.item(i)].remove(i)
+            children[new].append(i)
+            tree.parent[i] = new
+            delta = c - tree.cost.item(i)
+            tree.cost[i] = c
+            self._propagate(i, delta)
+        return better.any()
+
+    def _update_best(self, iteration):
+        if not self._goal_nodes:
+            return
+        goal_nodes = np.array(self._goal_nodes)
+        best = int(goal_nodes[np.argmin(self._tree.cost[goal_nodes])])
+        cost = self._tree.cost.item(best)
+        if self._best_goal < 0 or cost < self.cost_history[-1][1]:
+            self.cost_history.append((iteration, cost))
+        self._best_goal = best
+
+    def plan(self, stop_at_first=False):
+        """RRT* planning loop; runs the whole budget unless stop_at_first is set."""
+        tree, nn_index, collider = self._tree, self._nn_index, self._collider
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        done = 0
+        for i in range(self._max_iter):
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            done = i + 1
+            rand_x, rand_y = self._sample()
+            nearest = nn_index.nearest(rand_x, rand_y)
+            near_x, near_y = tree.point(nearest)
+            new_x, new_y, _ = self._steer(near_x, near_y, 0.0, rand_x, rand_y)
+            if (new_x, new_y) == (near_x, near_y) or not collider.is_free(near_x, near_y, new_x, new_y):
+                continue
+
+            # Choose parent: cheapest collision-free neighbour, all edges in one batch.
+            # The nearest vertex is always a candidate, even once the radius
+            # has shrunk below step_size.
+            near = nn_index.within(new_x, new_y, self._radius())
+            if not (near == nearest).any():
+                near = np.append(near, nearest)
+            dist = np.hypot(tree.x[near] - new_x, tree.y[near] - new_y)
+            free = collider.edges_free(np.column_stack((tree.x[near], tree.y[near])),
+                                       np.tile((new_x, new_y), (len(near), 1)))
+            through = np.where(free, tree.cost[near] + dist, np.inf)
+            best = int(np.argmin(through))
+            new = self._add(new_x, new_y, through.item(best), near.item(best))
+
+            changed = self._rewire(new, near, dist, free)
+            if self._reached_goal(new_x, new_y):
+                self._goal_nodes.append(new)
+                changed = True
+            if changed:
+                self._update_best(done)
+                if stop_at_first and self._best_goal >= 0:
+                    break
+
+        self._iterations += done
+        if self._best_goal >= 0:
+            self._path = tree.path_to(self._best_goal)
+            self._goal_reached = True
+
+    def path_cost(self):
+        """Cost of the current best path, or inf if none has been found."""
+        return self._tree.cost.item(self._best_goal) if self._best_goal >= 0 else math.inf
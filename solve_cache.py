@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from collision import segment_array
+
+_MISSING = object()
+
+
+def _canonical(value):
+    """Array form of a maze, wall list or Obstacle whose bytes do not depend on how it was passed in."""
+    if hasattr(value, "obstacle"):
+        value = segment_array(value)
+    arr = np.asarray(value)
+    if arr.dtype.kind in "biu":
+        return np.ascontiguousarray(arr, dtype=np.int64)
+    return np.ascontiguousarray(arr, dtype=np.float64)
+
+
+def content_key(algorithm, arrays=(), params=None):
+    """
+    SHA-256 hex key for one solve: the algorithm name, the contents (shape and values)
+    of each array-like input (maze grid, wall list or Obstacle; None is allowed) and
+    the JSON of params. The same maze as a nested list or as a uint8 array gives the
+    same key.
+    """
+    h = hashlib.sha256(str(algorithm).encode())
+    for value in arrays:
+        if value is None:
+            h.update(b"\0none")
+            continue
+        arr = _canonical(value)
+        h.update(f"\0{arr.dtype.str}{arr.shape}".encode())
+        h.update(arr.tobytes())
+    h.update(b"\0" + json.dumps(params or {}, sort_keys=True, default=repr).encode())
+    return h.hexdigest()
+
+
+class SolveCache:
+    """Solve results by content key: an in-memory LRU tier and an optional on-disk tier.
+
+    get() looks in memory first, then in `directory` (one pickle per key,
+    fanned out by the first two hex digits), promoting disk hits into memory.
+    put() writes both tiers; disk writes go through a temporary file and
+    os.replace so concurrent processes never read half a result. The disk tier
+    is not size-limited; clear() empties both. hits, disk_hits and misses count
+    lookups. Thread-safe.
+    """
+
+    def __init__(self, maxsize=256, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.hits = self.disk_hits = self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._memory)
+
+    def __contains__(self, key):
+        return key in self._memory or (self.directory is not None and os.path.exists(self._path(key)))
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".pkl")
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+        if self.directory is not None:
+            try:
+                with open(self._path(key), "rb") as f:
+                    value = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass
+            else:
+                with self._lock:
+                    self._remember(key, value)
+                    self.disk_hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+        if self.directory is not None:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+    def get_or_solve(self, key, solve):
+        """Cached value for key, or solve()'s result, which is then cached."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = solve()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.directory is not None:
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith(".pkl"):
+                        os.unlink(os.path.join(root, name))
+
+    def stats(self):
+        return {"entries": len(self._memory), "hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses}
+
+
+def cached_grid_solve(cache, maze, start, goal, solver="GridBFS"):
+    """path_result of grid_solvers.SOLVERS[solver] on maze, through cache."""
+    def solve():
+        from grid_solvers import SOLVERS
+
+        s = SOLVERS[solver](maze, tuple(start), tuple(goal))
+        s.solve()
+        return [tuple(cell) for cell in s.path_result]
+
+    key = content_key(solver, [maze], {"start": list(start), "goal": list(goal)})
+    return cache.get_or_solve(key, solve)
+
+
+def cached_plan(cache, start, goal, map_size=10, obstacle=None, planner="rrt", **params):
+    """
+    Run a parallel_rrt.PLANNERS planner once and return {"goal_reached", "path", "iterations", "nodes"},
+    through cache. Without a seed the run is random, so it is solved every time and never cached.
+    """
+    start = (start.x, start.y) if hasattr(start, "x") else tuple(start)
+    goal = (goal.x, goal.y) if hasattr(goal, "x") else tuple(goal)
+
+    def solve():
+        from RRT_mazesolving import Node
+        from parallel_rrt import PLANNERS
+
+        rrt = PLANNERS[planner](Node(*start), Node(*goal), map_size, obstacle=obstacle, **params)
+        rrt.plan()
+        return {"goal_reached": rrt._goal_reached, "path": rrt._path, "iterations": rrt._iterations,
+                "nodes": len(rrt._tree)}
+
+    if params.get("seed") is None:
+        return solve()
+    if obstacle is None:
+        from RRT_mazesolving import default_obstacle
+
+        obstacle = default_obstacle()
+    key = content_key(planner, [obstacle], dict(params, start=start, goal=goal, map_size=map_size))
+    return cache.get_or_solve(key, solve)
+
+
+if __name__ == "__main__":
+    import subprocess
+    import sys
+    import time
+
+    def import_time(module, runs=5):
+        code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+        env = dict(os.environ, MPLBACKEND="Agg")
+        return min(float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                        env=env, check=True).stdout) for _ in range(runs))
+
+    print(f"headless import RRT_mazesolving: {import_time('RRT_mazesolving') * 1000:.1f} ms "
+          f"(matplotlib.pyplot alone: {import_time('matplotlib.pyplot') * 1000:.1f} ms)")
+
+    from part2 import flood_maze
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SolveCache(directory=directory)
+        for label in ("first", "repeat"):
+            t0 = time.perf_counter()
+            result = cached_plan(cache, (0.5, 9.5), (9.5, 0.5), iter=50000, step_size=0.3, seed=0)
+            print(f"RRT {label}: {(time.perf_counter() - t0) * 1000:8.2f} ms, {len(result['path'])} path points")
+        maze = flood_maze(501, 501, seed=0)
+        for label in ("first", "repeat"):
+            t0 = time.perf_counter()
+            path = cached_grid_solve(cache, maze, (0, 0), (500, 500))
+            print(f"GridBFS {label}: {(time.perf_counter() - t0) * 1000:8.2f} ms, {len(path)} cells")
+        fresh = SolveCache(directory=directory)
+        t0 = time.perf_counter()
+        path = cached_grid_solve(fresh, maze.tolist(), (0, 0), (500, 500))
+        print(f"GridBFS from disk in a new cache: {(time.perf_counter() - t0) * 1000:8.2f} ms, {len(path)} cells")
+        print(cache.stats(), fresh.stats())
@@ -0,0 +1,22 @@
+import numpy as np
+
+from collision import SegmentCollider
+
+WALLS = [((5, 2), (5, 8)), ((2, 5), (8, 5)), ((3, 3), (4, 3))]
+
+
+def test_edge_ending_on_a_cell_corner_from_outside_the_walls():
+    broad = SegmentCollider(WALLS, cell_size=0.5)
+    assert not broad.is_free(0.763, 5.103, 2.0, 5.0)
+    assert not broad.edges_free([(0.763, 5.103)], [(2.0, 5.0)])[0]
+
+
+def test_broad_phase_matches_brute_force_on_lattice_edges():
+    rng = np.random.default_rng(5)
+    starts = rng.integers(0, 41, (50000, 2)) / 4 + rng.choice([0, 0.003, 0.103, -0.237], (50000, 2))
+    ends = rng.integers(0, 41, (50000, 2)) / 4
+    brute = SegmentCollider(WALLS, broad_phase=False).edges_free(starts, ends)
+    broad = SegmentCollider(WALLS, cell_size=0.5)
+    assert (broad.edges_free(starts, ends) == brute).all()
+    single = [broad.is_free(*s, *e) for s, e in zip(starts[:5000].tolist(), ends[:5000].tolist())]
+    assert (np.array(single) == brute[:5000]).all()
@@ -0,0 +1,33 @@
+from BFS_mazesolving import BFS
+from dstar_lite import DStarLite
+
+
+def test_freeing_a_walled_goal_finds_a_path():
+    maze = [[0, 0, 0], [0, 0, 0], [0, 0, 1]]
+    planner = DStarLite(maze, (0, 0), (2, 2))
+    assert not planner.solve()
+    path = planner.update_cells({(2, 2): 0})
+    assert path[0] == (0, 0) and path[-1] == (2, 2)
+    assert len(path) == 5
+
+
+def test_walling_the_goal_clears_the_path():
+    maze = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
+    planner = DStarLite(maze, (0, 0), (2, 2))
+    assert planner.solve()
+    assert planner.update_cells({(2, 2): 1}) == []
+    # And back again, matching a fresh BFS.
+    path = planner.update_cells({(2, 2): 0})
+    bfs = BFS(maze, (0, 0), (2, 2))
+    bfs.solve()
+    assert len(path) == len(bfs.path_result)
+
+
+def test_walled_start_matches_bfs():
+    maze = [[1, 0, 0], [0, 1, 0], [0, 0, 0]]
+    planner = DStarLite(maze, (0, 0), (2, 2))
+    bfs = BFS(maze, (0, 0), (2, 2))
+    assert planner.solve() == bfs.solve()
+    assert len(planner.path_result) == len(bfs.path_result)
+    # Walling the start later changes nothing either.
+    assert len(planner.update_cells({(0, 0): 1})) == len(bfs.path_result)
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from BFS_mazesolving import BFS
+from dstar_lite import DStarLite
+from grid_solvers import SOLVERS
+from wavefront import DistanceField
+
+# JPS-8 moves diagonally, so its paths are not comparable with BFS cell counts.
+FOUR_CONNECTED = [name for name in SOLVERS if name not in ("BFS", "JPS-8")]
+SEEDS = range(40)
+
+
+def random_maze(seed, size=24, density=0.3, walled_ends=False):
+    rng = np.random.default_rng(seed)
+    maze = (rng.random((size, size)) < density).astype(int)
+    start = tuple(rng.integers(0, size, 2).tolist())
+    goal = tuple(rng.integers(0, size, 2).tolist())
+    maze[start] = maze[goal] = 0
+    if walled_ends:
+        maze[start], maze[goal] = rng.integers(0, 2, 2)
+    return maze.tolist(), start, goal
+
+
+def bfs_path(maze, start, goal):
+    bfs = BFS(maze, start, goal)
+    bfs.solve()
+    return bfs.path_result
+
+
+def assert_valid_path(maze, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (r0, c0), (r1, c1) in zip(path, path[1:]):
+        assert abs(r0 - r1) + abs(c0 - c1) == 1
+    assert all(maze[r][c] == 0 for r, c in path)
+
+
+@pytest.mark.parametrize("name", FOUR_CONNECTED)
+def test_solver_matches_bfs_path_length(name):
+    for seed in SEEDS:
+        maze, start, goal = random_maze(seed)
+        expected = bfs_path(maze, start, goal)
+        solver = SOLVERS[name](maze, start, goal)
+        assert solver.solve() == bool(expected), seed
+        assert len(solver.path_result) == len(expected), seed
+        if expected:
+            assert_valid_path(maze, solver.path_result, start, goal)
+
+
+@pytest.mark.parametrize("name", FOUR_CONNECTED)
+def test_solver_matches_bfs_with_walled_ends(name):
+    # BFS still leaves a walled start but never enters a walled goal.
+    for seed in SEEDS:
+        maze, start, goal = random_maze(seed, size=12, walled_ends=True)
+        expected = bfs_path(maze, start, goal)
+        solver = SOLVERS[name](maze, start, goal)
+        assert solver.solve() == bool(expected), seed
+        assert len(solver.path_result) == len(expected), seed
+
+
+def test_distance_field_matches_bfs():
+    for seed in SEEDS:
+        maze, start, goal = random_maze(seed)
+        expected = bfs_path(maze, start, goal)
+        field = DistanceField(maze, start)
+        assert field.path_to(goal) == expected, seed
+        assert field.distance(goal) == len(expected) - 1, seed
+
+
+def test_dstar_lite_repairs_match_bfs():
+    rng = np.random.default_rng(0)
+    maze, start, goal = random_maze(0, density=0.2)
+    planner = DStarLite(maze, start, goal)
+    planner.solve()
+    for _ in range(30):
+        r, c = rng.integers(0, len(maze), 2).tolist()
+        if (r, c) == start:
+            continue
+        maze[r][c] = 1 - maze[r][c]
+        path = planner.update_cells({(r, c): maze[r][c]})
+        assert len(path) == len(bfs_path(maze, start, goal))
@@ -0,0 +1,143 @@
+import numpy as np
+
+
+class TreeStore:
+    """Struct-of-arrays tree: x, y, cost and parent index per vertex, grown by doubling.
+
+    The root has parent -1. Scalars are read with .item() in hot loops so
+    callers get plain Python floats and ints rather than NumPy scalars.
+    """
+
+    def __init__(self, capacity=1024):
+        capacity = max(1, capacity)
+        self.x = np.empty(capacity)
+        self.y = np.empty(capacity)
+        self.cost = np.empty(capacity)
+        self.parent = np.empty(capacity, dtype=np.int64)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    def _grow(self):
+        capacity = 2 * len(self.x)
+        self.x = np.resize(self.x, capacity)
+        self.y = np.resize(self.y, capacity)
+        self.cost = np.resize(self.cost, capacity)
+        self.parent = np.resize(self.parent, capacity)
+
+    def add(self, x, y, cost=0.0, parent=-1):
+        """Append a vertex and return its index."""
+        if self._n == len(self.x):
+            self._grow()
+        i = self._n
+        self.x[i] = x
+        self.y[i] = y
+        self.cost[i] = cost
+        self.parent[i] = parent
+        self._n += 1
+        return i
+
+    def point(self, i):
+        return self.x.item(i), self.y.item(i)
+
+    def path_to(self, i):
+        """[[x, y], ...] from the root down to vertex i."""
+        x, y, parent = self.x, self.y, self.parent
+        path = []
+        while i >= 0:
+            path.append([x.item(i), y.item(i)])
+            i = parent.item(i)
+        return path[::-1]
+
+    def edges(self):
+        """(k, 2, 2) array of parent -> child segments for every non-root vertex."""
+        n = self._n
+        child = np.flatnonzero(self.parent[:n] >= 0)
+        parent = self.parent[child]
+        return np.stack((np.column_stack((self.x[parent], self.y[parent])),
+                         np.column_stack((self.x[child], self.y[child]))), axis=1)
+
+    def node(self, i):
+        return NodeView(self, i)
+
+    def nodes(self):
+        return TreeNodes(self)
+
+
+class NodeView:
+    """Node-compatible handle onto one vertex of a TreeStore."""
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def x(self):
+        return self.tree.x.item(self.index)
+
+    @x.setter
+    def x(self, value):
+        self.tree.x[self.index] = value
+
+    @property
+    def y(self):
+        return self.tree.y.item(self.index)
+
+    @y.setter
+    def y(self, value):
+        self.tree.y[self.index] = value
+
+    @property
+    def cost(self):
+        return self.tree.cost.item(self.index)
+
+    @cost.setter
+    def cost(self, value):
+        self.tree.cost[self.index] = value
+
+    @property
+    def parent(self):
+        p = self.tree.parent.item(self.index)
+        return None if p < 0 else NodeView(self.tree, p)
+
+    @parent.setter
+    def parent(self, node):
+        self.tree.parent[self.index] = -1 if node is None else node.index
+
+    def __eq__(self, other):
+        return isinstance(other, NodeView) and other.tree is self.tree and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self):
+        return f"NodeView({self.index}, x={self.x}, y={self.y})"
+
+
+class TreeNodes:
+    """Read-only sequence of NodeViews standing in for the old list of Node objects."""
+
+    __slots__ = ("tree",)
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def __len__(self):
+        return len(self.tree)
+
+    def __getitem__(self, i):
+        n = len(self.tree)
+        if isinstance(i, slice):
+            return [NodeView(self.tree, j) for j in range(*i.indices(n))]
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("tree node index out of range")
+        return NodeView(self.tree, i)
+
+    def __iter__(self):
+        for i in range(len(self.tree)):
+            yield NodeView(self.tree, i)
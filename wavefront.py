@@ -0,0 +1,83 @@
+import numpy as np
+
+from BFS_mazesolving import padded_blocked
+
+
+class DistanceField:
+    """Frontier-synchronous BFS from one start cell over the whole grid.
+
+    Each step expands the entire frontier at once: neighbour indices are the
+    frontier shifted by +-1 row and +-1 column in the flattened, wall-padded
+    grid, and masks drop walls and cells already reached. Candidates are taken
+    frontier-cell-major in BFS.neighbors order and each new cell keeps its
+    first claim, so parents (and therefore paths) are exactly those of
+    BFS.solve().
+
+    `distances` is a (rows, cols) int32 array (-1 where unreachable) and
+    `moves` a uint8 array naming the step that entered each cell
+    (0 = start/unreached, then down, up, right, left).
+    """
+
+    def __init__(self, maze, start):
+        blocked = padded_blocked(maze)
+        self.rows, self.cols = blocked.shape[0] - 2, blocked.shape[1] - 2
+        self.width = w = self.cols + 2
+        self.start = tuple(start)
+        self._offsets = np.array([w, -w, 1, -1])
+
+        closed = blocked.ravel().astype(bool)
+        dist = np.full(closed.size, -1, dtype=np.int32)
+        moves = np.zeros(closed.size, dtype=np.uint8)
+        frontier = np.array([self._index(*self.start)])
+        closed[frontier] = True
+        dist[frontier] = 0
+        depth = 0
+        while frontier.size:
+            depth += 1
+            cand = (frontier[:, None] + self._offsets).ravel()
+            open_at = np.flatnonzero(~closed[cand])
+            cand = cand[open_at]
+            _, first = np.unique(cand, return_index=True)
+            first.sort()
+            frontier = cand[first]
+            closed[frontier] = True
+            dist[frontier] = depth
+            moves[frontier] = open_at[first] % 4 + 1
+
+        self._dist = dist
+        self._moves = moves
+        self.distances = dist.reshape(self.rows + 2, w)[1:-1, 1:-1]
+        self.moves = moves.reshape(self.rows + 2, w)[1:-1, 1:-1]
+
+    def _index(self, r, c):
+        return (r + 1) * self.width + c + 1
+
+    def distance(self, goal):
+        """Steps from start to goal, or -1 if it cannot be reached."""
+        return int(self.distances[goal])
+
+    def distances_to(self, goals):
+        """Distances for a sequence of (r, c) goals, in one array lookup."""
+        goals = np.asarray(goals, dtype=np.int64).reshape(-1, 2)
+        return self.distances[goals[:, 0], goals[:, 1]]
+
+    def path_to(self, goal):
+        """Shortest path [(r, c), ...] from start to goal, or [] if unreachable."""
+        if not (0 <= goal[0] < self.rows and 0 <= goal[1] < self.cols) or self.distances[goal] < 0:
+            return []
+        offsets, moves, w = self._offsets.tolist(), self._moves, self.width
+        node = self._index(*goal)
+        path = []
+        while True:
+            r, c = divmod(node, w)
+            path.append((r - 1, c - 1))
+            move = moves.item(node)
+            if not move:
+                break
+            node -= offsets[move - 1]
+        path.reverse()
+        return path
+
+    def paths_to(self, goals):
+        """{goal: path_to(goal)} for many goals against the same start."""
+        return {tuple(goal): self.path_to(tuple(goal)) for goal in goals}